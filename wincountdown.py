@@ -3,29 +3,162 @@ import time
 import os
 import ctypes
 import winsound
+import msvcrt
 import argparse
 import json
 import shlex
+import subprocess
+import threading
+import cProfile
+import pstats
+import tracemalloc
+import io
+import mmap
+import queue
+import sqlite3
+import struct
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
 from ctypes import wintypes
-from datetime import datetime
+from datetime import datetime, timedelta
 
 # ============================================================================
 # CONSTANTS
 # ============================================================================
 
 # Console constants
+STD_INPUT_HANDLE = -10
 STD_OUTPUT_HANDLE = -11
+WAIT_OBJECT_0 = 0
+CTRL_C_EVENT = 0
 CURSOR_SIZE = 100
+ENABLE_VIRTUAL_TERMINAL_PROCESSING = 0x0004
 BORDER_WIDTH = 115
+DISPLAY_WIDTH = 120  # Console columns the time display is drawn into
 ASCII_HEIGHT = 8
-
-# Time constants  
-MAX_STANDARD_SECONDS = 359999  # 99:59:59
-MAX_METRIC_MILLISECONDS = 999999000  # 99:99:99 metric
+BLANK_GLYPH = ["           "] * ASCII_HEIGHT
+GLYPH_CHARS = '0123456789:'  # Characters a formatted time is drawn from
+CJK_CODE_PAGES = (932, 936, 949, 950)  # Console code pages that draw ambiguous-width characters 2 cells wide
 
 # Display constants
-UPDATE_INTERVAL_STANDARD = 0.05
-UPDATE_INTERVAL_METRIC = 0.01
+TIME_ROW = 8  # Console row of the first line of the ASCII art time
+LABELS_ROW = 20  # Console row of the "Start time / End time" labels
+KEYS_HELP = "Space pause  +/- 1 min  R reset  N next  Ctrl+C stop"
+PAUSED_HELP = "PAUSED - press Space to resume"
+
+# Wakeup constants
+PAUSED_WAKE_INTERVAL = 1.0  # Seconds between wakeups while paused
+WAKE_MARGIN = 0.001  # Extra wait so the clock has passed the next change on wakeup
+CTRL_C_GRACE = 0.1  # Seconds an interruptible sleep waits for Python to raise KeyboardInterrupt
+
+# Output modes ('auto' picks console for a terminal, json otherwise)
+OUTPUT_MODES = ['auto', 'console', 'json', 'plain']
+
+# Frame writer constants
+FRAME_SLOW_WRITE = 0.05  # Seconds a frame write may take before the console counts as slow
+FRAME_SLOW_WRITES = 2  # Slow writes before frames move to the background writer
+
+# Config hot-reload constants
+CONFIG_POLL_INTERVAL = 2.0  # Seconds between config file stat checks
+
+# Config sections that can change while a timer is running
+RELOADABLE_SECTIONS = {
+    "ascii_digits": ["ascii_digits"],
+    "alert": ["default_frequency", "default_beeps", "default_duration", "default_gap", "default_silent"],
+    "hooks": ["on_finish_hooks", "on_cycle_hooks", "hook_timeout"]
+}
+
+# Profiler constants
+PROFILE_TOP_FUNCTIONS = 40
+PROFILE_TOP_ALLOCATIONS = 20
+
+# Status export constants
+# Layout: header (magic, layout version, reserved, seqlock counter) followed by
+# payload (deadline, remaining and total seconds, cycle, state, display field
+# count, display string, time base name). The counter is odd while the payload is
+# being written. The display string is cut to fit; time base names must fit whole.
+STATUS_MAGIC = b'WCDS'
+STATUS_VERSION = 2
+STATUS_TEXT_SIZE = 16
+STATUS_HEADER = struct.Struct('<4sHHI')
+STATUS_PAYLOAD = struct.Struct(f'<dddIBB2x{STATUS_TEXT_SIZE}s{STATUS_TEXT_SIZE}s')
+STATUS_SEQ_OFFSET = 8
+STATUS_SIZE = 96
+STATUS_RUNNING, STATUS_PAUSED, STATUS_FINISHED, STATUS_STOPPED = range(4)
+STATUS_NAMES = ['running', 'paused', 'finished', 'stopped']
+STATUS_READ_RETRIES = 100
+
+# Font pack constants
+# Layout: header (magic, layout version, font count, reserved) followed by an
+# index of fixed-size entries (name, offset, length) sorted by name, then the
+# font records. A record is UTF-8 text: the glyph characters on the first line,
+# then ASCII_HEIGHT rows for each of those characters in the same order.
+FONT_PACK_MAGIC = b'WCFP'
+FONT_PACK_VERSION = 1
+FONT_PACK_HEADER = struct.Struct('<4sHHI')
+FONT_PACK_ENTRY = struct.Struct('<32sII')
+FONT_NAME_SIZE = 32
+
+# History constants
+# Runs, cycles and hook results are only ever inserted. The cycles and hooks indexes
+# cover every column stats reads, so a range query walks only the index entries inside the range
+HISTORY_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY, started REAL NOT NULL, duration REAL NOT NULL, base TEXT NOT NULL,
+    loop INTEGER NOT NULL, silent INTEGER NOT NULL, freq INTEGER NOT NULL, beeps INTEGER NOT NULL,
+    beep_duration INTEGER NOT NULL, gap INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS cycles (
+    id INTEGER PRIMARY KEY, run_id INTEGER NOT NULL REFERENCES runs(id), cycle INTEGER NOT NULL,
+    started REAL NOT NULL, deadline REAL NOT NULL, ended REAL NOT NULL, drift_ms REAL,
+    outcome TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS hooks (
+    id INTEGER PRIMARY KEY, run_id INTEGER NOT NULL REFERENCES runs(id), event TEXT NOT NULL,
+    cycle INTEGER NOT NULL, started REAL NOT NULL, command TEXT NOT NULL, status TEXT NOT NULL,
+    exit_code INTEGER, latency_ms REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_started ON runs(started);
+CREATE INDEX IF NOT EXISTS cycles_started ON cycles(started, run_id, outcome, ended, drift_ms);
+CREATE INDEX IF NOT EXISTS hooks_started ON hooks(started, exit_code, latency_ms);
+'''
+HISTORY_CLOSE_TIMEOUT = 5.0  # Seconds to wait for queued history rows at exit
+HISTORY_GROUPS = {'day': '%Y-%m-%d', 'week': '%Y-W%W', 'month': '%Y-%m'}
+HISTORY_SPANS = {'h': 3600, 'd': 86400, 'w': 604800}
+
+# Hook constants
+HOOK_QUEUE_PER_WORKER = 4  # Pending hook runs allowed per worker before new ones are dropped
+
+# ANSI SGR codes for color names used in the config
+ANSI_CODES = {
+    "default": "39", "bold": "1",
+    "black": "30", "red": "31", "green": "32", "yellow": "33",
+    "blue": "34", "magenta": "35", "cyan": "36", "white": "37",
+    "bright_black": "90", "bright_red": "91", "bright_green": "92", "bright_yellow": "93",
+    "bright_blue": "94", "bright_magenta": "95", "bright_cyan": "96", "bright_white": "97"
+}
+ANSI_RESET = "\x1b[0m"
+
+# Precomputed two-digit strings for 00-99
+TWO_DIGITS = [f"{i:02d}" for i in range(100)]
+
+# Precomputed padding strings, indexed by width
+SPACES = [" " * i for i in range(DISPLAY_WIDTH + 1)]
+
+# Largest lower-field span formatted from lookup tables (metric time needs 10000);
+# bases beyond it would take too long to tabulate and use one divmod per field
+TIME_TABLE_LIMIT = 10000
+
+# Time display bases
+# unit: counter ticks per displayed second (metric counts in milliseconds)
+# radices: size of each field below the top one, e.g. [60, 60] for HH:MM:SS
+# The top field is capped at 99, so the maximum time is 99 followed by the
+# highest value of every lower field (99:59:59 standard, 99:99:99 metric)
+DEFAULT_TIME_BASES = {
+    "standard": {"unit": 1, "radices": [60, 60], "label": ""},
+    "metric": {"unit": 1000, "radices": [100, 100], "label": "metric"}
+}
 
 # Default ASCII art for digits
 DEFAULT_ASCII_DIGITS = {
@@ -151,10 +284,25 @@ DEFAULT_CONFIG = {
     "default_silent": False,
     "default_loop": False,
     "default_metric": False,
+    "default_base": "standard",
+    "default_output": "auto",
     "enable_no_args_default": False,
     "no_args_default_command": "help",
     "enable_time_only_defaults": False,
     "time_only_default_flags": [],
+    "on_finish_hooks": [],
+    "on_cycle_hooks": [],
+    "hook_workers": 2,
+    "hook_timeout": 30,
+    "enable_colors": True,
+    "color_thresholds": [{"below": 60, "color": "yellow"}, {"below": 10, "color": "red"}],
+    "cell_colors": {},
+    "enable_status_export": True,
+    "enable_history": True,
+    "font": "",
+    "font_pack": "wincountdown-fonts.wcfp",
+    "ambiguous_width": "auto",
+    "time_bases": DEFAULT_TIME_BASES,
     "ascii_digits": DEFAULT_ASCII_DIGITS
 }
 
@@ -168,6 +316,14 @@ class COORD(ctypes.Structure):
 class CONSOLE_CURSOR_INFO(ctypes.Structure):
     _fields_ = [("dwSize", wintypes.DWORD), ("bVisible", wintypes.BOOL)]
 
+class SMALL_RECT(ctypes.Structure):
+    _fields_ = [("Left", ctypes.c_short), ("Top", ctypes.c_short),
+                ("Right", ctypes.c_short), ("Bottom", ctypes.c_short)]
+
+class CONSOLE_SCREEN_BUFFER_INFO(ctypes.Structure):
+    _fields_ = [("dwSize", COORD), ("dwCursorPosition", COORD), ("wAttributes", wintypes.WORD),
+                ("srWindow", SMALL_RECT), ("dwMaximumWindowSize", COORD)]
+
 # ============================================================================
 # LOGGER CLASS
 # ============================================================================
@@ -198,7 +354,8 @@ class Logger:
         if self.file_path:
             with open(self.file_path, 'a', encoding='utf-8') as f:
                 f.write(log_message)
-        print(log_message.rstrip())
+        # Diagnostics stay off stdout, which may be carrying the event stream
+        print(log_message.rstrip(), file=sys.stderr)
 
 # Global logger instance
 logger = Logger()
@@ -234,8 +391,29 @@ class ConsoleManager:
         self.kernel32.SetConsoleCursorPosition(self.h_console, coord)
         
     def clear_screen(self):
-        """Clear screen"""
-        os.system('cls')
+        """Clear screen through the console API instead of spawning 'cls'"""
+        sys.stdout.flush()
+        info = CONSOLE_SCREEN_BUFFER_INFO()
+        if not self.kernel32.GetConsoleScreenBufferInfo(self.h_console, ctypes.byref(info)):
+            os.system('cls')
+            return
+        
+        cells = info.dwSize.X * info.dwSize.Y
+        origin = COORD(0, 0)
+        written = wintypes.DWORD()
+        self.kernel32.FillConsoleOutputCharacterW(self.h_console, ctypes.c_wchar(' '), cells,
+                                                  origin, ctypes.byref(written))
+        self.kernel32.FillConsoleOutputAttribute(self.h_console, info.wAttributes, cells,
+                                                 origin, ctypes.byref(written))
+        self.kernel32.SetConsoleCursorPosition(self.h_console, origin)
+    
+    def enable_virtual_terminal(self):
+        """Enable ANSI escape processing, returns False if the console lacks it"""
+        mode = wintypes.DWORD()
+        if not self.kernel32.GetConsoleMode(self.h_console, ctypes.byref(mode)):
+            return False
+        return bool(self.kernel32.SetConsoleMode(self.h_console,
+                                                 mode.value | ENABLE_VIRTUAL_TERMINAL_PROCESSING))
         
     def __enter__(self):
         """Context manager entry - hide cursor"""
@@ -246,6 +424,62 @@ class ConsoleManager:
         """Context manager exit - show cursor"""
         self.show_cursor()
 
+# ============================================================================
+# CONSOLE INPUT CLASS
+# ============================================================================
+
+class ConsoleInput:
+    """Waits for a key press, Ctrl+C and the next deadline in a single call"""
+    
+    def __init__(self):
+        self.enabled = sys.stdin is not None and sys.stdin.isatty()
+        if self.enabled:
+            self.kernel32 = ctypes.windll.kernel32
+            self.kernel32.CreateEventW.restype = wintypes.HANDLE
+            self.h_input = self.kernel32.GetStdHandle(STD_INPUT_HANDLE)
+            
+            # Ctrl+C does not signal the input handle, so a console control handler
+            # sets an event as well. It returns False so Python still raises
+            # KeyboardInterrupt; the callback is kept referenced for the whole run.
+            self.h_ctrl = self.kernel32.CreateEventW(None, True, False, None)
+            self.handles = (wintypes.HANDLE * 2)(self.h_input, self.h_ctrl)
+            self.ctrl_handler = ctypes.WINFUNCTYPE(wintypes.BOOL, wintypes.DWORD)(self._on_ctrl)
+            self.kernel32.SetConsoleCtrlHandler(self.ctrl_handler, True)
+    
+    def _on_ctrl(self, ctrl_type):
+        """Console control handler, called on a system thread"""
+        if ctrl_type == CTRL_C_EVENT:
+            self.kernel32.SetEvent(self.h_ctrl)
+        return False
+    
+    def wait(self, timeout):
+        """Block until a key is pressed or timeout seconds pass, return the key or None"""
+        if not self.enabled:
+            time.sleep(max(0.0, timeout))
+            return None
+        
+        result = self.kernel32.WaitForMultipleObjects(2, self.handles, False, max(0, int(timeout * 1000)))
+        if result == WAIT_OBJECT_0 + 1:
+            # Python's own handler runs right after ours; its sleep is interrupted
+            # as soon as the KeyboardInterrupt is pending
+            time.sleep(CTRL_C_GRACE)
+            self.kernel32.ResetEvent(self.h_ctrl)
+            return None
+        if result != WAIT_OBJECT_0:
+            return None
+        
+        if msvcrt.kbhit():
+            key = msvcrt.getwch()
+            if key in ('\x00', '\xe0'):
+                # Arrow and function keys send a second code, neither is a control key
+                msvcrt.getwch()
+                return None
+            return key
+        
+        # Woken by key releases, mouse or focus events, discard them
+        self.kernel32.FlushConsoleInputBuffer(self.h_input)
+        return None
+
 # ============================================================================
 # CONFIG MANAGER CLASS
 # ============================================================================
@@ -256,6 +490,12 @@ class ConfigManager:
     def __init__(self, script_dir):
         self.config_file = os.path.join(script_dir, "wincountdown-config.json")
         self.debug_log_file = os.path.join(script_dir, "wincountdown-debug.log")
+        self.profile_file = os.path.join(script_dir, "wincountdown-profile.txt")
+        self.status_file = os.path.join(script_dir, "wincountdown-status.bin")
+        self.history_file = os.path.join(script_dir, "wincountdown-history.db")
+        self.file_stat = None
+        self.last_check = 0.0
+        self.section_snapshots = {}
         
     def create_config_content(self):
         """Create a configuration file with detailed comments"""
@@ -298,6 +538,12 @@ class ConfigManager:
     "default_metric": false,
     "//metric": "Metric mode (joke): true = display in metric time (1h=100m, 1m=100s), false = normal time",
     
+    "default_base": "standard",
+    "//base": "Time base used for the display, by name from time_bases below (-m always selects metric)",
+    
+    "default_output": "auto",
+    "//output": "Output mode: 'auto' (console in a terminal, json when piped), 'console', 'json' (JSON Lines events) or 'plain' (text events)",
+    
     "//separator2": "",
     "//adv": "--- ADVANCED BEHAVIORS ---",
     "//adv1": "Configure these options to customize behavior for specific use cases",
@@ -335,6 +581,74 @@ class ConfigManager:
     "//timeonly_flags7": "Note: Only applies when JUST time is typed. Manual flags disable this.",
     
     "//separator4": "",
+    "//hooks": "=== COMPLETION HOOKS ===",
+    "//hooks1": "Commands run in the background when a countdown finishes or a loop cycle restarts",
+    "//hooks2": "Hooks never delay the countdown or the alert. Their output is discarded.",
+    "//hooks3": "The environment variables WINCOUNTDOWN_EVENT (finish/cycle) and WINCOUNTDOWN_CYCLE are set",
+    
+    "on_finish_hooks": [],
+    "//finish_hooks": "Commands to run when a countdown finishes. Example: [\\"msg * Time is up\\"]",
+    
+    "on_cycle_hooks": [],
+    "//cycle_hooks": "Commands to run each time loop mode restarts the countdown",
+    
+    "hook_workers": 2,
+    "//hook_workers": "Maximum number of hooks running at the same time",
+    
+    "hook_timeout": 30,
+    "//hook_timeout": "Seconds before a running hook is killed",
+    
+    "//separator5": "",
+    "//status": "=== STATUS EXPORT ===",
+    
+    "enable_status_export": true,
+    "//status1": "Publish the running timer's state to wincountdown-status.bin for status bars",
+    "//status2": "Read it with 'wincountdown status' or by mapping the file (see README for the layout)",
+    
+    "//separator6": "",
+    "//history": "=== HISTORY ===",
+    
+    "enable_history": true,
+    "//history1": "Record every run and cycle (start, end, drift, settings) in wincountdown-history.db",
+    "//history2": "Query it with 'wincountdown stats', e.g. wincountdown stats --since 7d --by day",
+    
+    "//separator7": "",
+    "//bases_section": "=== TIME BASES ===",
+    "//bases1": "Each base defines how the remaining time is split into display fields",
+    "//bases2": "  unit: counter ticks per displayed second (1 = seconds, 1000 = milliseconds)",
+    "//bases3": "  radices: size of each field below the top one, e.g. [60, 60] for HH:MM:SS",
+    "//bases4": "  label: shown next to the time in error messages",
+    "//bases5": "Every radix must be between 2 and 100. The top field is capped at 99.",
+    "//bases6": "Add your own base here and select it with --base NAME or default_base",
+    
+    "time_bases": ''' + json.dumps(DEFAULT_TIME_BASES, indent=8) + ''',
+    
+    "//separator8": "",
+    "//colors": "=== COLORS ===",
+    "//colors1": "Color names: black, red, green, yellow, blue, magenta, cyan, white,",
+    "//colors2": "  bright_black ... bright_white, default. Add 'bold', e.g. 'bold red'",
+    
+    "enable_colors": true,
+    "//enable_colors": "Set to false (or use --no-color) for a monochrome display",
+    
+    "color_thresholds": [{"below": 60, "color": "yellow"}, {"below": 10, "color": "red"}],
+    "//color_thresholds": "Color of the digits once fewer than 'below' displayed seconds remain",
+    
+    "cell_colors": {},
+    "//cell_colors": "Color for individual glyph characters. Example: {\\"░\\": \\"bright_black\\"}",
+    
+    "//separator9": "",
+    "//fonts": "=== FONT PACKS ===",
+    
+    "font": "",
+    "//font1": "Name of a font in the font pack to use instead of ascii_digits below",
+    "//font2": "Leave empty to use ascii_digits. List the fonts with 'wincountdown fonts'",
+    
+    "font_pack": "wincountdown-fonts.wcfp",
+    "//font_pack1": "Font pack file, relative to this config file's folder",
+    "//font_pack2": "Add fonts with 'wincountdown fonts add FILE.json' (see README for the format)",
+    
+    "//separator10": "",
     "//ascii_art_section": "=== ASCII ART CUSTOMIZATION ===",
     "//ascii_art1": "Customize the appearance of digits (0-9) and colon (:) in the countdown display",
     "//ascii_art2": "Each digit must be exactly 8 lines tall and have consistent width",
@@ -343,6 +657,10 @@ class ConfigManager:
     "//ascii_art5": "TIP: Preview your changes by running a short countdown like: wincountdown 10s",
     "//ascii_art6": "",
     
+    "ambiguous_width": "auto",
+    "//ambiguous_width1": "Cells taken by ambiguous-width characters such as █ and ░: 1, 2 or \\"auto\\"",
+    "//ambiguous_width2": "auto uses 2 on CJK console code pages (932, 936, 949, 950) and 1 elsewhere",
+    
     "ascii_digits": ''' + json.dumps(DEFAULT_ASCII_DIGITS, indent=8) + '''
 }'''
     
@@ -355,28 +673,42 @@ class ConfigManager:
             logger.log("Config file does not exist, creating new one")
             with open(self.config_file, 'w', encoding='utf-8') as f:
                 f.write(self.create_config_content())
-            print(f"Created default configuration file: {self.config_file}")
-            print("You can edit this file to customize default settings.\n")
+            print(f"Created default configuration file: {self.config_file}", file=sys.stderr)
+            print("You can edit this file to customize default settings.\n", file=sys.stderr)
+            self._remember_file(DEFAULT_CONFIG)
             return DEFAULT_CONFIG.copy()
         
         try:
-            logger.log("Attempting to read config file")
-            with open(self.config_file, 'r', encoding='utf-8') as f:
-                config = json.load(f)
-            
-            logger.log(f"Raw config loaded from file: {config}")
-            
-            # Filter out comment fields (they start with //)
-            filtered_config = {k: v for k, v in config.items() if not k.startswith('//')}
-            logger.log(f"Filtered config (comments removed): {filtered_config}")
+            filtered_config = self._read_file()
+            self._remember_file(filtered_config)
             
             # Merge with defaults to ensure all keys exist
             merged_config = DEFAULT_CONFIG.copy()
             merged_config.update(filtered_config)
             
+            # Validate time_bases if present
+            if 'time_bases' in filtered_config:
+                self._validate_time_bases(filtered_config['time_bases'], merged_config)
+            
             # Validate ascii_digits if present
             if 'ascii_digits' in filtered_config:
-                self._validate_ascii_digits(filtered_config['ascii_digits'], merged_config)
+                self.validate_ascii_digits(filtered_config['ascii_digits'], merged_config)
+            
+            self._validate_colors(merged_config)
+            
+            # Validate hooks with the same rules as a reload, falling back to the defaults
+            hook_keys = RELOADABLE_SECTIONS['hooks']
+            if not self._validate_section('hooks', {key: merged_config[key] for key in hook_keys}):
+                merged_config.update({key: DEFAULT_CONFIG[key] for key in hook_keys})
+            workers = merged_config['hook_workers']
+            if isinstance(workers, bool) or not isinstance(workers, int) or workers < 1:
+                logger.log(f"Warning: hook_workers must be a positive whole number, using {DEFAULT_CONFIG['hook_workers']}")
+                merged_config['hook_workers'] = DEFAULT_CONFIG['hook_workers']
+            
+            ambiguous = merged_config['ambiguous_width']
+            if isinstance(ambiguous, bool) or ambiguous not in ('auto', 1, 2):
+                logger.log("Warning: ambiguous_width must be 1, 2 or \"auto\", using \"auto\"")
+                merged_config['ambiguous_width'] = DEFAULT_CONFIG['ambiguous_width']
             
             # Setup logger with debug mode from config
             logger.setup(merged_config.get('debug_mode', False), self.debug_log_file)
@@ -388,19 +720,451 @@ class ConfigManager:
         except (json.JSONDecodeError, IOError) as e:
             error_msg = f"Warning: Could not read config file ({e}), using defaults"
             logger.log(error_msg)
-            print(error_msg)
+            print(error_msg, file=sys.stderr)
             return DEFAULT_CONFIG.copy()
     
-    def _validate_ascii_digits(self, ascii_digits, merged_config):
+    def _read_file(self):
+        """Read the config file and strip comment fields"""
+        logger.log("Attempting to read config file")
+        with open(self.config_file, 'r', encoding='utf-8') as f:
+            config = json.load(f)
+        
+        logger.log(f"Raw config loaded from file: {config}")
+        
+        # Filter out comment fields (they start with //)
+        filtered_config = {k: v for k, v in config.items() if not k.startswith('//')}
+        logger.log(f"Filtered config (comments removed): {filtered_config}")
+        return filtered_config
+    
+    def _stat_file(self):
+        """Return (mtime, size) of the config file, or None if it is missing"""
+        try:
+            st = os.stat(self.config_file)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+    
+    def _snapshot_sections(self, config):
+        """Serialize each reloadable section so changes can be detected by comparison"""
+        return {name: json.dumps([config.get(key) for key in keys], sort_keys=True)
+                for name, keys in RELOADABLE_SECTIONS.items()}
+    
+    def _remember_file(self, config):
+        """Record the file state and section contents that were just loaded"""
+        self.file_stat = self._stat_file()
+        self.last_check = time.monotonic()
+        self.section_snapshots = self._snapshot_sections(config)
+    
+    def check_for_changes(self):
+        """Return validated values of reloadable sections changed since the last check"""
+        now = time.monotonic()
+        if now - self.last_check < CONFIG_POLL_INTERVAL:
+            return None
+        self.last_check = now
+        
+        file_stat = self._stat_file()
+        if file_stat is None or file_stat == self.file_stat:
+            return None
+        self.file_stat = file_stat
+        
+        try:
+            filtered_config = self._read_file()
+        except (json.JSONDecodeError, IOError) as e:
+            # Editors may save in several steps, the next complete write is picked up
+            logger.log(f"Warning: Could not reload config file ({e}), keeping current settings")
+            return None
+        
+        snapshots = self._snapshot_sections(filtered_config)
+        changes = {}
+        for name, keys in RELOADABLE_SECTIONS.items():
+            if snapshots[name] == self.section_snapshots.get(name):
+                continue
+            section = {key: filtered_config.get(key, DEFAULT_CONFIG[key]) for key in keys}
+            if self._validate_section(name, section):
+                logger.log(f"Config section '{name}' changed: {section}")
+                changes.update(section)
+                self.section_snapshots[name] = snapshots[name]
+        
+        return changes or None
+    
+    def _validate_section(self, name, section):
+        """Validate a reloaded section, returning False if it should be ignored"""
+        if name == 'ascii_digits':
+            if not isinstance(section['ascii_digits'], dict):
+                logger.log("Warning: ascii_digits must be an object, keeping current digits")
+                return False
+            self.validate_ascii_digits(section['ascii_digits'], section)
+        elif name == 'alert':
+            if (not isinstance(section['default_frequency'], int) or not 37 <= section['default_frequency'] <= 32767
+                    or not isinstance(section['default_beeps'], int) or section['default_beeps'] < 1
+                    or not isinstance(section['default_duration'], int) or section['default_duration'] < 1
+                    or not isinstance(section['default_gap'], int) or section['default_gap'] < 0):
+                logger.log("Warning: Invalid alert settings in config, keeping current alert")
+                return False
+        elif name == 'hooks':
+            timeout = section['hook_timeout']
+            if (not isinstance(section['on_finish_hooks'], list) or not isinstance(section['on_cycle_hooks'], list)
+                    or isinstance(timeout, bool) or not isinstance(timeout, (int, float)) or timeout <= 0):
+                logger.log("Warning: Invalid hook settings in config, keeping current hooks")
+                return False
+        return True
+    
+    def _validate_colors(self, merged_config):
+        """Validate the shape of the color settings, falling back to the defaults"""
+        thresholds = merged_config['color_thresholds']
+        if not isinstance(thresholds, list) or not all(
+                isinstance(t, dict) and isinstance(t.get('below'), (int, float)) and not isinstance(t['below'], bool)
+                for t in thresholds):
+            logger.log("Warning: color_thresholds must be a list of {\"below\": number, \"color\": name}, using defaults")
+            merged_config['color_thresholds'] = DEFAULT_CONFIG['color_thresholds']
+        if not isinstance(merged_config['cell_colors'], dict):
+            logger.log("Warning: cell_colors must be an object of character to color, using defaults")
+            merged_config['cell_colors'] = DEFAULT_CONFIG['cell_colors']
+    
+    def _validate_time_bases(self, time_bases, merged_config):
+        """Validate time base definitions, dropping invalid ones"""
+        if not isinstance(time_bases, dict):
+            logger.log("Warning: time_bases must be an object, using defaults")
+            merged_config['time_bases'] = DEFAULT_TIME_BASES
+            return
+        
+        for name, base in list(time_bases.items()):
+            unit = base.get('unit') if isinstance(base, dict) else None
+            radices = base.get('radices') if isinstance(base, dict) else None
+            if (not isinstance(unit, int) or unit < 1 or not isinstance(radices, list)
+                    or not all(isinstance(r, int) and 2 <= r <= 100 for r in radices)):
+                logger.log(f"Warning: Invalid time base '{name}', ignoring it")
+                del time_bases[name]
+            elif not name.isascii() or len(name) > STATUS_TEXT_SIZE:
+                # The status export stores the name to find the base again
+                logger.log(f"Warning: Time base name '{name}' must be at most {STATUS_TEXT_SIZE} ASCII "
+                           f"characters, ignoring it")
+                del time_bases[name]
+        
+        for name, base in DEFAULT_TIME_BASES.items():
+            if name not in time_bases:
+                time_bases[name] = base
+    
+    def validate_ascii_digits(self, ascii_digits, merged_config):
         """Validate ASCII art digits configuration"""
-        for digit in '0123456789:':
+        for digit in GLYPH_CHARS:
             if digit not in ascii_digits:
                 logger.log(f"Warning: Missing ASCII art for '{digit}', using default")
                 ascii_digits[digit] = DEFAULT_ASCII_DIGITS[digit]
-            elif not isinstance(ascii_digits[digit], list) or len(ascii_digits[digit]) != ASCII_HEIGHT:
+            elif (not isinstance(ascii_digits[digit], list) or len(ascii_digits[digit]) != ASCII_HEIGHT
+                    or not all(isinstance(row, str) for row in ascii_digits[digit])):
                 logger.log(f"Warning: Invalid ASCII art for '{digit}' (must be {ASCII_HEIGHT} lines), using default")
                 ascii_digits[digit] = DEFAULT_ASCII_DIGITS[digit]
 
+# ============================================================================
+# CELL WIDTH HELPERS
+# ============================================================================
+
+def resolve_ambiguous_width(setting):
+    """Cells per ambiguous-width character: the configured 1 or 2, or taken from the console code page"""
+    if setting in (1, 2):
+        return setting
+    return 2 if ctypes.windll.kernel32.GetConsoleOutputCP() in CJK_CODE_PAGES else 1
+
+def cell_width(text, ambiguous=1):
+    """Terminal cell width of a string: wide characters take 2 cells, ambiguous ones 1 or 2, combining marks 0"""
+    width = 0
+    for char in text:
+        if unicodedata.combining(char) or unicodedata.category(char) in ('Mn', 'Me', 'Cf'):
+            continue
+        east_asian = unicodedata.east_asian_width(char)
+        width += 2 if east_asian in ('W', 'F') else ambiguous if east_asian == 'A' else 1
+    return width
+
+def clip_cells(text, width, ambiguous=1):
+    """Cut a string to at most the given number of terminal cells"""
+    used = 0
+    for i, char in enumerate(text):
+        used += cell_width(char, ambiguous)
+        if used > width:
+            return text[:i]
+    return text
+
+# ============================================================================
+# TIME FORMATTER CLASS
+# ============================================================================
+
+class TimeFormatter:
+    """Converts remaining time into display strings using precomputed tables"""
+    
+    def __init__(self, unit=1, radices=(60, 60), label=""):
+        self.unit = unit
+        self.radices = tuple(radices)
+        self.label = label
+        self.max_fields = len(self.radices) + 1
+        
+        # Seconds covered by each field, smallest first: [1, 60, 3600] for standard time
+        self.spans = [1]
+        for radix in reversed(self.radices):
+            self.spans.append(self.spans[-1] * radix)
+        self.top_span = self.spans[-1]
+        self.max_value = (100 * self.top_span - 1) * unit
+        
+        # Ticks in one unit of the second-lowest field (one minute in standard time)
+        self.minute = self.spans[1] * unit if self.radices else unit
+        
+        # Lower-field tables are built on first use, one per field count
+        self.tabulated = self.top_span <= TIME_TABLE_LIMIT
+        self._tables = {}
+        
+        # Without tables: the radix of each field below the top one, smallest first,
+        # and one reusable list of field strings per field count
+        self.field_radices = list(reversed(self.radices))
+        self._parts = [None] + [[''] * fields for fields in range(1, self.max_fields + 1)]
+    
+    @classmethod
+    def from_config(cls, base):
+        """Create a formatter from a time_bases entry"""
+        return cls(base.get('unit', 1), base.get('radices', [60, 60]), base.get('label', ""))
+    
+    def _table(self, fields):
+        """Return the table mapping a value below top_span to its last N fields"""
+        table = self._tables.get(fields)
+        if table is None:
+            table = []
+            for value in range(self.top_span):
+                parts = []
+                for radix in reversed(self.radices):
+                    value, digit = divmod(value, radix)
+                    parts.append(TWO_DIGITS[digit])
+                table.append(':'.join(reversed(parts[:fields])))
+            self._tables[fields] = table
+        return table
+    
+    def fields_for(self, ticks):
+        """Number of fields needed to show the given time"""
+        value = ticks // self.unit
+        fields = 1
+        for span in self.spans[1:]:
+            if value >= span:
+                fields += 1
+        return fields
+    
+    def format(self, ticks, fields):
+        """Format ticks as a display string with the given number of fields"""
+        if not self.tabulated:
+            return self._format_fields(ticks // self.unit, fields)
+        top, low = divmod(ticks // self.unit, self.top_span)
+        if fields < self.max_fields:
+            return self._table(fields)[low]
+        top_str = TWO_DIGITS[top] if top < 100 else str(top)
+        if fields == 1:
+            return top_str
+        return top_str + ':' + self._table(fields - 1)[low]
+    
+    def _format_fields(self, value, fields):
+        """Format a value of a base too large to tabulate with one divmod per field"""
+        parts = self._parts[fields]
+        
+        # One divmod per field, smallest first; every radix is at most 100
+        for i in range(fields - 1):
+            value, digit = divmod(value, self.field_radices[i])
+            parts[fields - 1 - i] = TWO_DIGITS[digit]
+        
+        # Only the top field of the base may grow past its radix
+        if fields < self.max_fields:
+            value %= self.field_radices[fields - 1]
+        parts[0] = TWO_DIGITS[value] if value < 100 else str(value)
+        return ':'.join(parts)
+
+# ============================================================================
+# COLOR ATTRIBUTES CLASS
+# ============================================================================
+
+class ColorAttributes:
+    """Attaches colors to glyph cells and encodes them as run-length escape spans"""
+    
+    def __init__(self, thresholds, cell_colors):
+        # State 0 uses the terminal default, state N the Nth threshold from the top
+        self.thresholds = []
+        for threshold in sorted(thresholds, key=lambda t: -t.get('below', 0)):
+            codes = self._codes(threshold.get('color'))
+            if codes is not None and isinstance(threshold.get('below'), (int, float)):
+                self.thresholds.append((threshold['below'], codes))
+        self.cell_colors = {}
+        for char, color in cell_colors.items():
+            codes = self._codes(color)
+            if codes is not None:
+                self.cell_colors[char] = codes
+        self.cache = {}
+        self.escapes = {}
+    
+    @classmethod
+    def from_config(cls, config):
+        """Create the attribute layer from config, or None when colors are disabled"""
+        if not config.get('enable_colors', True):
+            return None
+        return cls(config.get('color_thresholds', []), config.get('cell_colors', {}))
+    
+    def _codes(self, color):
+        """Convert a color spec like 'bold red' to SGR codes, None if invalid"""
+        names = color.split() if isinstance(color, str) else []
+        if not names or any(name not in ANSI_CODES for name in names):
+            logger.log(f"Warning: Unknown color '{color}', ignoring it")
+            return None
+        return ';'.join(ANSI_CODES[name] for name in names)
+    
+    def escape(self, codes):
+        """Escape sequence that switches to the given attributes from any state"""
+        sequence = self.escapes.get(codes)
+        if sequence is None:
+            sequence = f"\x1b[0;{codes}m" if codes else ANSI_RESET
+            self.escapes[codes] = sequence
+        return sequence
+    
+    def state_for(self, seconds):
+        """Threshold state for the displayed seconds remaining"""
+        state = 0
+        for i, (below, _) in enumerate(self.thresholds):
+            if seconds < below:
+                state = i + 1
+        return state
+    
+    def base_codes(self, state):
+        """Attributes of plain cells in a threshold state"""
+        return self.thresholds[state - 1][1] if state else ''
+    
+    def encode_glyph(self, char, glyph, state):
+        """Encode glyph rows as (entry attributes, text with inner escapes, exit attributes)"""
+        key = (char, state)
+        rows = self.cache.get(key)
+        if rows is None:
+            base = self.base_codes(state)
+            rows = []
+            for row in glyph:
+                parts = []
+                entry = current = None
+                for cell in row:
+                    # Blank cells show no foreground, so they never force an attribute change
+                    if cell != ' ':
+                        codes = self.cell_colors.get(cell, base)
+                        if current is None:
+                            entry = current = codes
+                        elif codes != current:
+                            parts.append(self.escape(codes))
+                            current = codes
+                    parts.append(cell)
+                rows.append((entry, ''.join(parts), current))
+            self.cache[key] = rows
+        return rows
+    
+    def join_row(self, spans, separator, left='', right=''):
+        """Join encoded glyph rows, emitting an escape only where attributes change"""
+        parts = [left]
+        current = ''
+        for entry, text, exit_codes in spans:
+            if entry is not None and entry != current:
+                parts.append(self.escape(entry))
+            parts.append(text)
+            parts.append(separator)
+            if exit_codes is not None:
+                current = exit_codes
+        if current:
+            parts.append(ANSI_RESET)
+        parts.append(right)
+        return ''.join(parts)
+    
+    def clear(self):
+        """Drop cached glyph encodings after a font change"""
+        self.cache.clear()
+
+# ============================================================================
+# FRAME WRITER CLASS
+# ============================================================================
+
+class FrameWriter:
+    """Writes display frames, moving them to a background thread once the console falls behind"""
+    
+    def __init__(self, console):
+        self.console = console
+        self.frames_written = 0
+        self.frames_dropped = 0
+        self.slow_writes = 0
+        self.slowest_write = 0.0
+        self.pending = {}
+        self.writing = False
+        self.closing = False
+        self.condition = threading.Condition()
+        self.thread = None
+    
+    def submit(self, region, first_row, lines):
+        """Write lines from a console row, keeping only the latest per region when behind"""
+        if self.thread is None:
+            self._write(first_row, lines)
+            return
+        with self.condition:
+            if region in self.pending:
+                self.frames_dropped += 1
+            # Callers reuse their line buffers, so a queued frame needs its own copy
+            self.pending[region] = (first_row, list(lines))
+            self.condition.notify_all()
+    
+    def _write(self, first_row, lines):
+        """Write one frame and measure how long the console took to accept it"""
+        write_start = time.perf_counter()
+        row = first_row
+        for text in lines:
+            self.console.set_position(0, row)
+            sys.stdout.write(text)
+            sys.stdout.flush()
+            row += 1
+        latency = time.perf_counter() - write_start
+        self.frames_written += 1
+        self.slowest_write = max(self.slowest_write, latency)
+        
+        if latency > FRAME_SLOW_WRITE and self.thread is None:
+            self.slow_writes += 1
+            if self.slow_writes >= FRAME_SLOW_WRITES:
+                logger.log(f"Console write took {latency * 1000:.1f}ms, dropping frames that fall behind")
+                self.thread = threading.Thread(target=self._run, daemon=True)
+                self.thread.start()
+    
+    def _run(self):
+        """Write the newest pending frames until closed"""
+        while True:
+            with self.condition:
+                while not self.pending and not self.closing:
+                    self.condition.wait()
+                if self.closing:
+                    return
+                frames = list(self.pending.values())
+                self.pending.clear()
+                self.writing = True
+            for first_row, lines in frames:
+                self._write(first_row, lines)
+            with self.condition:
+                self.writing = False
+                self.condition.notify_all()
+    
+    def drain(self):
+        """Drop pending frames and wait for the one being written before a full redraw"""
+        if self.thread is None:
+            return
+        with self.condition:
+            self.frames_dropped += len(self.pending)
+            self.pending.clear()
+            while self.writing:
+                self.condition.wait()
+    
+    def close(self):
+        """Stop the writer thread and log the frame counters"""
+        if self.thread is not None:
+            with self.condition:
+                self.closing = True
+                self.frames_dropped += len(self.pending)
+                self.pending.clear()
+                self.condition.notify_all()
+            self.thread.join()
+            self.thread = None
+            self.closing = False
+        logger.log(f"Frames written: {self.frames_written}, dropped: {self.frames_dropped}, "
+                   f"slowest write: {self.slowest_write * 1000:.1f}ms")
+
 # ============================================================================
 # DISPLAY MANAGER CLASS
 # ============================================================================
@@ -408,8 +1172,40 @@ class ConfigManager:
 class DisplayManager:
     """Handles all display formatting and rendering"""
     
-    def __init__(self, ascii_art):
+    def __init__(self, ascii_art, colors=None, ambiguous_width=1):
+        self.colors = colors
+        self.writer = None
+        self.ambiguous_width = ambiguous_width
+        
+        # Buffers reused by every tick: the frame rows and the pieces joined into each row
+        self.frame = [''] * ASCII_HEIGHT
+        self.glyph_buffer = []
+        self.part_buffer = []
+        self.set_font(ascii_art)
+    
+    def set_font(self, ascii_art):
+        """Use new ASCII art digits from the next frame on, keeping the current ones if measuring fails"""
+        # Measure every drawn glyph once and pad its rows to the same cell width.
+        # Other keys in ascii_art are never drawn and are not validated, so skip them
+        glyphs = {}
+        glyph_widths = {}
+        for char in GLYPH_CHARS:
+            rows = ascii_art.get(char, BLANK_GLYPH)
+            widths = [cell_width(row, self.ambiguous_width) for row in rows]
+            glyph_width = max(widths)
+            glyphs[char] = [row + " " * (glyph_width - width) for row, width in zip(rows, widths)]
+            glyph_widths[char] = glyph_width
+        
         self.ascii_art = ascii_art
+        self.glyphs = glyphs
+        self.glyph_widths = glyph_widths
+        
+        # Glyph rows with the gap to the next glyph already appended
+        self.cells = {char: [row + "  " for row in glyph] for char, glyph in glyphs.items()}
+        self.blank_cells = [row + "  " for row in BLANK_GLYPH]
+        
+        if self.colors is not None:
+            self.colors.clear()
         
     def draw_border(self, char='='):
         """Draw a border line"""
@@ -417,24 +1213,25 @@ class DisplayManager:
     
     def draw_line(self, content='', centered=False):
         """Draw a line with optional centered content"""
+        width = cell_width(content, self.ambiguous_width)
         if centered and content:
-            padding = (BORDER_WIDTH - len(content)) // 2
-            return f"  |{' ' * padding}{content}{' ' * (BORDER_WIDTH - padding - len(content))}|"
-        return f"  |{content:{BORDER_WIDTH}}|"
+            padding = (BORDER_WIDTH - width) // 2
+            return f"  |{' ' * padding}{content}{' ' * (BORDER_WIDTH - padding - width)}|"
+        return f"  |{content}{' ' * (BORDER_WIDTH - width)}|"
     
     def get_ascii_digit(self, digit):
         """Return ASCII art for a single digit from config"""
-        return self.ascii_art.get(digit, ["           "] * ASCII_HEIGHT)
-    
-    def render_time(self, hours, minutes, seconds, show_hours, show_minutes):
-        """Render time as ASCII art - only show relevant units"""
-        if show_hours:
-            time_str = f"{hours:02d}:{minutes:02d}:{seconds:02d}"
-        elif show_minutes:
-            time_str = f"{minutes:02d}:{seconds:02d}"
-        else:
-            time_str = f"{seconds:02d}"
-        
+        return self.glyphs.get(digit, BLANK_GLYPH)
+    
+    def time_width(self, time_str):
+        """Cell width of a rendered time string, from the widths measured at font load"""
+        width = 0
+        for char in time_str:
+            width += self.glyph_widths.get(char, len(BLANK_GLYPH[0])) + 2
+        return width
+    
+    def render_time(self, time_str):
+        """Render a formatted time string as ASCII art"""
         # Use list comprehension and join for better performance
         lines = []
         for i in range(ASCII_HEIGHT):
@@ -447,32 +1244,59 @@ class DisplayManager:
         
         return lines
     
-    def draw_static_ui(self, total_seconds, show_hours, show_minutes, metric=False, 
-                      start_time_str="", end_time_str="", console=None):
+    def render_colored(self, time_str, state):
+        """Render ASCII art with the cached color spans of each glyph"""
+        glyphs = [self.colors.encode_glyph(char, self.get_ascii_digit(char), state) for char in time_str]
+        return [self.colors.join_row([glyph[i] for glyph in glyphs], "  ") for i in range(ASCII_HEIGHT)]
+    
+    def _size_buffers(self, count, parts):
+        """Resize the tick buffers, which only happens when the number of characters changes"""
+        if len(self.glyph_buffer) != count:
+            self.glyph_buffer = [None] * count
+        if len(self.part_buffer) != parts:
+            self.part_buffer = [''] * parts
+    
+    def fill_frame(self, time_str, left_padding, right_padding):
+        """Render the time into the reused frame rows, padding included"""
+        count = len(time_str)
+        self._size_buffers(count, count + 2)
+        glyphs = self.glyph_buffer
+        parts = self.part_buffer
+        for j in range(count):
+            glyphs[j] = self.cells.get(time_str[j], self.blank_cells)
+        
+        parts[0] = left_padding
+        parts[count + 1] = right_padding
+        for i in range(ASCII_HEIGHT):
+            for j in range(count):
+                parts[j + 1] = glyphs[j][i]
+            self.frame[i] = ''.join(parts)
+    
+    def fill_colored_frame(self, time_str, state, left_padding, right_padding):
+        """Render the time with its cached color spans into the reused frame rows"""
+        count = len(time_str)
+        self._size_buffers(count, count)
+        glyphs = self.glyph_buffer
+        spans = self.part_buffer
+        for j in range(count):
+            char = time_str[j]
+            glyphs[j] = self.colors.encode_glyph(char, self.get_ascii_digit(char), state)
+        
+        for i in range(ASCII_HEIGHT):
+            for j in range(count):
+                spans[j] = glyphs[j][i]
+            self.frame[i] = self.colors.join_row(spans, "  ", left_padding, right_padding)
+    
+    def draw_static_ui(self, time_display, start_time_str="", end_time_str="", console=None):
         """Draw the static parts of the UI once"""
+        if self.writer is not None:
+            self.writer.drain()
+        
         if console:
             console.clear_screen()
         else:
             os.system('cls')
         
-        # Format the initial time for display
-        if metric:
-            total_metric_seconds = total_seconds // 1000
-            hours = total_metric_seconds // 10000
-            minutes = (total_metric_seconds % 10000) // 100
-            seconds = total_metric_seconds % 100
-        else:
-            hours = total_seconds // 3600
-            minutes = (total_seconds % 3600) // 60
-            seconds = total_seconds % 60
-        
-        if show_hours:
-            time_display = f"{hours:02d}:{minutes:02d}:{seconds:02d}"
-        elif show_minutes:
-            time_display = f"{minutes:02d}:{seconds:02d}"
-        else:
-            time_display = f"{seconds:02d}"
-        
         # Top border with decoration
         print("\n")
         print(self.draw_border())
@@ -495,8 +1319,18 @@ class DisplayManager:
         print(self.draw_border())
         
         # First line: labels
+        print(self.draw_labels(KEYS_HELP))
+        
+        # Second line: actual times
+        space_between = BORDER_WIDTH - len(start_time_str) - len(end_time_str)
+        print("  |" + start_time_str + " " * space_between + end_time_str + "|")
+        
+        print(self.draw_border())
+        print("  stropitor")
+    
+    def draw_labels(self, center_text):
+        """Draw the start/end time labels with text in between"""
         start_label = "Start time:"
-        center_text = "Press Ctrl+C to stop"
         end_label = "End time:"
         
         total_side_length = len(start_label) + len(end_label)
@@ -504,37 +1338,57 @@ class DisplayManager:
         left_space = remaining_space // 2
         right_space = remaining_space - left_space
         
-        print("  |" + start_label + " " * left_space + center_text + 
-              " " * right_space + end_label + "|")
-        
-        # Second line: actual times
-        space_between = BORDER_WIDTH - len(start_time_str) - len(end_time_str)
-        print("  |" + start_time_str + " " * space_between + end_time_str + "|")
-        
-        print(self.draw_border())
-        print("  stropitor")
+        return ("  |" + start_label + " " * left_space + center_text + 
+                " " * right_space + end_label + "|")
+    
+    def write_frame(self, region, first_row, lines, console):
+        """Hand a frame to the frame writer, creating one on first use"""
+        if self.writer is None:
+            self.writer = FrameWriter(console)
+        self.writer.submit(region, first_row, lines)
     
-    def update_time_display(self, hours, minutes, seconds, show_hours, show_minutes, console):
+    def show_paused(self, paused, console):
+        """Swap the key help for a pause notice and back"""
+        labels = self.draw_labels(PAUSED_HELP if paused else KEYS_HELP)
+        self.write_frame('labels', LABELS_ROW, [labels], console)
+    
+    def update_time_display(self, time_str, console, seconds=0):
         """Update only the time display portion"""
-        lines = self.render_time(hours, minutes, seconds, show_hours, show_minutes)
-        
-        # Calculate the actual width of the time display
-        time_width = len(lines[0])
+        # Calculate the actual width of the time display in terminal cells
+        time_width = self.time_width(time_str)
         
-        # Center within the box - pre-calculate padding
-        x_offset = 3 + (BORDER_WIDTH - time_width) // 2
-        left_padding = " " * x_offset
-        right_padding = " " * (120 - x_offset - time_width)
+        # Center within the box using the precomputed padding strings
+        x_offset = max(0, 3 + (BORDER_WIDTH - time_width) // 2)
+        left_padding = SPACES[x_offset]
+        fits = x_offset + time_width <= DISPLAY_WIDTH
         
-        # Draw all lines in one pass
-        for i, line in enumerate(lines):
-            console.set_position(0, 8 + i)
-            # Build the full line more efficiently
-            print(f"{left_padding}{line.rstrip()}{right_padding}"[:120], end='', flush=True)
+        if fits:
+            right_padding = SPACES[DISPLAY_WIDTH - x_offset - time_width]
+            if self.colors is not None:
+                self.fill_colored_frame(time_str, self.colors.state_for(seconds), left_padding, right_padding)
+            else:
+                self.fill_frame(time_str, left_padding, right_padding)
+            self.write_frame('time', TIME_ROW, self.frame, console)
+        else:
+            # Clip by cells so wide glyphs never wrap onto the next row. Colored rows
+            # carry escapes, so an oversized time is always drawn monochrome
+            lines = [left_padding + clip_cells(line, DISPLAY_WIDTH - x_offset, self.ambiguous_width)
+                     for line in self.render_time(time_str)]
+            self.write_frame('time', TIME_ROW, lines, console)
+    
+    def notify_alert(self, beeps):
+        """Alerts are only audible on the console display"""
+        pass
     
-    def draw_finished_screen(self, show_hours, show_minutes, loop=False):
+    def draw_finished_screen(self, zero_display, loop=False, console=None):
         """Draw the time's up screen"""
-        os.system('cls')
+        if self.writer is not None:
+            self.writer.drain()
+        
+        if console:
+            console.clear_screen()
+        else:
+            os.system('cls')
         
         print("\n")
         print(self.draw_border())
@@ -552,16 +1406,13 @@ class DisplayManager:
         print()
         
         # Show final time (00:00:00 or 00:00 or 00)
-        if show_hours:
-            lines = self.render_time(0, 0, 0, True, True)
-        elif show_minutes:
-            lines = self.render_time(0, 0, 0, False, True)
+        if self.colors is not None:
+            lines = self.render_colored(zero_display, self.colors.state_for(0))
         else:
-            lines = self.render_time(0, 0, 0, False, False)
+            lines = self.render_time(zero_display)
         
         # Center the final time display
-        time_width = len(lines[0])
-        x_offset = 2 + (BORDER_WIDTH - time_width) // 2
+        x_offset = max(0, 2 + (BORDER_WIDTH - self.time_width(zero_display)) // 2)
         
         for line in lines:
             print(" " * x_offset + line)
@@ -573,6 +1424,611 @@ class DisplayManager:
         print(self.draw_border())
         print("  stropitor")
 
+# ============================================================================
+# STREAM DISPLAY CLASS
+# ============================================================================
+
+class StreamDisplay:
+    """Emits one machine-readable event per state change instead of ASCII art"""
+    
+    def __init__(self, output='json', stream=None):
+        self.json = output == 'json'
+        self.stream = stream or sys.stdout
+        self.cycle = 0
+    
+    def emit(self, event, **fields):
+        """Write a single event line"""
+        if self.json:
+            fields = {"event": event, "cycle": self.cycle, "t": round(time.time(), 3), **fields}
+            line = json.dumps(fields, separators=(',', ':'))
+        else:
+            line = ' '.join([event] + [f"{key}={str(value).lower() if isinstance(value, bool) else value}"
+                                       for key, value in fields.items()])
+        self.stream.write(line + "\n")
+        self.stream.flush()
+    
+    def draw_static_ui(self, time_display, start_time_str="", end_time_str="", console=None):
+        """Announce the start of a countdown cycle"""
+        self.cycle += 1
+        self.emit("start" if self.cycle == 1 else "restart",
+                  total=time_display, start=start_time_str, end=end_time_str)
+    
+    def update_time_display(self, time_str, console, seconds=0):
+        """Announce the new remaining time"""
+        self.emit("tick", remaining=time_str)
+    
+    def show_paused(self, paused, console):
+        """Announce that the countdown was paused or resumed"""
+        self.emit("pause" if paused else "resume")
+    
+    def notify_alert(self, beeps):
+        """Announce that the alert is playing"""
+        self.emit("alert", beeps=beeps)
+    
+    def draw_finished_screen(self, zero_display, loop=False, console=None):
+        """Announce the end of a countdown cycle"""
+        self.emit("finish", loop=loop)
+
+# ============================================================================
+# HOOK RUNNER CLASS
+# ============================================================================
+
+def kill_process_tree(process):
+    """Kill a shell and every process it started, killing only cmd.exe would leave them running"""
+    try:
+        subprocess.run(['taskkill', '/T', '/F', '/PID', str(process.pid)], stdin=subprocess.DEVNULL,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    except OSError as e:
+        logger.log(f"Could not run taskkill ({e}), killing only the shell")
+    process.kill()
+    process.wait()
+
+class HookRunner:
+    """Runs finish and cycle hook commands in a bounded background worker pool"""
+    
+    def __init__(self, config):
+        self.configure(config)
+        self.workers = config.get('hook_workers', 2)
+        self.slots = threading.BoundedSemaphore(self.workers * HOOK_QUEUE_PER_WORKER)
+        self.history = None  # HistoryStore that hook results are recorded in, if any
+        self.executor = None
+        
+        # Queued hooks and running hook processes, cancelled and killed if the timer is stopped
+        self.futures = set()
+        self.processes = set()
+        self.lock = threading.Lock()
+        self.stopping = False
+    
+    def configure(self, config):
+        """Set hook commands and timeout, used at startup and on config reload"""
+        self.hooks = {
+            'finish': [c for c in config.get('on_finish_hooks', []) if isinstance(c, str) and c.strip()],
+            'cycle': [c for c in config.get('on_cycle_hooks', []) if isinstance(c, str) and c.strip()]
+        }
+        self.timeout = config.get('hook_timeout', 30)
+    
+    def submit(self, event, cycle):
+        """Queue every hook for an event without waiting for any of them"""
+        for command in self.hooks[event]:
+            if not self.slots.acquire(blocking=False):
+                logger.log(f"Hook queue full, dropping {event} hook: {command}")
+                continue
+            if self.executor is None:
+                self.executor = ThreadPoolExecutor(max_workers=self.workers,
+                                                   thread_name_prefix='wincountdown-hook')
+            future = self.executor.submit(self._run_hook, command, event, cycle)
+            with self.lock:
+                self.futures.add(future)
+            future.add_done_callback(self._release_slot)
+    
+    def _release_slot(self, future):
+        """Free a queue slot once a hook has run or been cancelled"""
+        with self.lock:
+            self.futures.discard(future)
+        self.slots.release()
+    
+    def _run_hook(self, command, event, cycle):
+        """Run a single hook command and record its status, exit code and latency"""
+        env = dict(os.environ, WINCOUNTDOWN_EVENT=event, WINCOUNTDOWN_CYCLE=str(cycle))
+        started = time.time()
+        start = time.perf_counter()
+        exit_code = None
+        try:
+            process = subprocess.Popen(command, shell=True, env=env, stdin=subprocess.DEVNULL,
+                                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            with self.lock:
+                self.processes.add(process)
+                stopping = self.stopping
+            try:
+                # The timer may have stopped while this hook was starting
+                if stopping:
+                    kill_process_tree(process)
+                exit_code = process.wait(timeout=self.timeout)
+                status = "stopped with the timer" if self.stopping else f"exit code {exit_code}"
+            except subprocess.TimeoutExpired:
+                kill_process_tree(process)
+                status = "timed out"
+            finally:
+                with self.lock:
+                    self.processes.discard(process)
+        except OSError as e:
+            status = f"failed to start ({e})"
+        except Exception as e:
+            # The executor would keep this to itself, so record it here
+            status = f"failed ({type(e).__name__}: {e})"
+        
+        latency_ms = (time.perf_counter() - start) * 1000
+        if self.history is not None:
+            self.history.record_hook(event, cycle, started, command, status, exit_code, latency_ms)
+        logger.log(f"Hook '{command}' ({event}, cycle {cycle}) {status} after {latency_ms:.1f}ms")
+    
+    def shutdown(self, wait=True):
+        """Stop the worker pool, waiting for hooks or cancelling queued ones and killing running ones"""
+        if self.executor is None:
+            return
+        if wait:
+            self.executor.shutdown()
+        else:
+            # The interpreter joins worker threads at exit, so nothing may be left to run
+            with self.lock:
+                self.stopping = True
+                futures = list(self.futures)
+                processes = list(self.processes)
+            for future in futures:
+                future.cancel()
+            self.executor.shutdown(wait=False)
+            for process in processes:
+                kill_process_tree(process)
+        self.executor = None
+
+# ============================================================================
+# STATUS EXPORT CLASS
+# ============================================================================
+
+class StatusExport:
+    """Publishes timer state into a fixed-layout memory-mapped file guarded by a seqlock"""
+    
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self.map = None
+        self.seq = 0
+        self.base = b''
+    
+    def open(self, base='standard'):
+        """Create or reuse the status file and map it"""
+        self.base = base.encode('ascii', 'replace')
+        with open(self.file_path, 'a+b') as f:
+            f.truncate(STATUS_SIZE)
+            self.map = mmap.mmap(f.fileno(), STATUS_SIZE)
+        STATUS_HEADER.pack_into(self.map, 0, STATUS_MAGIC, STATUS_VERSION, 0, self.seq)
+    
+    def update(self, deadline, remaining, total, cycle, state, display):
+        """Rewrite the payload in place, readers retry while the counter is odd"""
+        self.seq += 1
+        struct.pack_into('<I', self.map, STATUS_SEQ_OFFSET, self.seq)
+        STATUS_PAYLOAD.pack_into(self.map, STATUS_HEADER.size, deadline, remaining, total, cycle, state,
+                                 display.count(':') + 1, display.encode('ascii', 'replace'), self.base)
+        self.seq += 1
+        struct.pack_into('<I', self.map, STATUS_SEQ_OFFSET, self.seq)
+    
+    def close(self):
+        """Unmap the status file, leaving the last state readable"""
+        if self.map is not None:
+            self.map.close()
+            self.map = None
+
+def read_status(file_path):
+    """Read a consistent status snapshot without locking, None if unavailable"""
+    try:
+        with open(file_path, 'rb') as f:
+            status_map = mmap.mmap(f.fileno(), STATUS_SIZE, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    
+    try:
+        for _ in range(STATUS_READ_RETRIES):
+            magic, version, _, seq = STATUS_HEADER.unpack_from(status_map, 0)
+            if magic != STATUS_MAGIC or version != STATUS_VERSION:
+                return None
+            if seq % 2:
+                continue
+            payload = STATUS_PAYLOAD.unpack_from(status_map, STATUS_HEADER.size)
+            if struct.unpack_from('<I', status_map, STATUS_SEQ_OFFSET)[0] == seq:
+                deadline, remaining, total, cycle, state, fields, display, base = payload
+                return {"deadline": deadline, "remaining": remaining, "total": total, "cycle": cycle,
+                        "state": STATUS_NAMES[state], "paused": state == STATUS_PAUSED, "fields": fields,
+                        "display": display.rstrip(b'\x00').decode('ascii'),
+                        "base": base.rstrip(b'\x00').decode('ascii')}
+        return None
+    finally:
+        status_map.close()
+
+# ============================================================================
+# HISTORY STORE CLASS
+# ============================================================================
+
+class HistoryStore:
+    """Appends runs and cycles to an SQLite database from a background thread"""
+    
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self.queue = queue.Queue()
+        self.thread = None
+    
+    def open(self):
+        """Start the writer thread, which opens the database itself"""
+        self.thread = threading.Thread(target=self._run, name='wincountdown-history', daemon=True)
+        self.thread.start()
+    
+    def record_run(self, started, duration, base, loop, silent, freq, beeps, beep_duration, gap):
+        """Queue the settings of a new run; its cycles are recorded against it"""
+        self.queue.put(('run', (started, duration, base, loop, silent, freq, beeps, beep_duration, gap)))
+    
+    def record_cycle(self, cycle, started, deadline, ended, drift_ms, outcome):
+        """Queue a finished, skipped or stopped cycle"""
+        self.queue.put(('cycle', (cycle, started, deadline, ended, drift_ms, outcome)))
+    
+    def record_hook(self, event, cycle, started, command, status, exit_code, latency_ms):
+        """Queue the result of a hook run, called from the hook workers"""
+        self.queue.put(('hook', (event, cycle, started, command, status, exit_code, latency_ms)))
+    
+    def _run(self):
+        """Insert queued rows until closed, committing each one"""
+        try:
+            connection = sqlite3.connect(self.file_path)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(HISTORY_SCHEMA)
+        except sqlite3.Error as e:
+            logger.log(f"Could not open history database ({e}), history disabled")
+            return
+        
+        run_id = None
+        while True:
+            item = self.queue.get()
+            if item is None:
+                break
+            kind, row = item
+            try:
+                if kind == 'run':
+                    run_id = connection.execute(
+                        "INSERT INTO runs (started, duration, base, loop, silent, freq, beeps, beep_duration, gap) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", row).lastrowid
+                elif run_id is None:
+                    continue
+                elif kind == 'cycle':
+                    connection.execute(
+                        "INSERT INTO cycles (run_id, cycle, started, deadline, ended, drift_ms, outcome) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?)", (run_id,) + row)
+                else:
+                    connection.execute(
+                        "INSERT INTO hooks (run_id, event, cycle, started, command, status, exit_code, latency_ms) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?, ?)", (run_id,) + row)
+                connection.commit()
+            except sqlite3.Error as e:
+                logger.log(f"Could not write history ({e})")
+        connection.close()
+    
+    def close(self):
+        """Let the writer finish the queued rows, waiting a bounded time"""
+        if self.thread is not None:
+            self.queue.put(None)
+            self.thread.join(HISTORY_CLOSE_TIMEOUT)
+            self.thread = None
+
+def parse_history_time(text):
+    """Parse a stats range bound: 'today', a span back from now like 7d, or an ISO date and time"""
+    text = text.strip().lower()
+    if text == 'today':
+        return datetime.now().replace(hour=0, minute=0, second=0, microsecond=0).timestamp()
+    if text[:-1].isdigit() and text[-1:] in HISTORY_SPANS:
+        return time.time() - int(text[:-1]) * HISTORY_SPANS[text[-1]]
+    return datetime.fromisoformat(text).timestamp()
+
+def format_hours(seconds):
+    """Format a total number of seconds as H:MM:SS, without capping the hours"""
+    minutes, seconds = divmod(int(round(seconds)), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}"
+
+def stats_command(args, history_file):
+    """Print aggregate counts, time and drift for cycles, and hook results, in a time range"""
+    parser = argparse.ArgumentParser(prog='wincountdown stats', add_help=False)
+    parser.add_argument('--since', default=None, metavar='WHEN')
+    parser.add_argument('--until', default=None, metavar='WHEN')
+    parser.add_argument('--by', choices=list(HISTORY_GROUPS), default=None)
+    options = parser.parse_args(args)
+    
+    try:
+        since = parse_history_time(options.since) if options.since else 0.0
+        until = parse_history_time(options.until) if options.until else time.time()
+    except ValueError:
+        print("Error: Invalid date (use YYYY-MM-DD, YYYY-MM-DDTHH:MM, today, or a span like 12h, 7d, 4w)")
+        sys.exit(1)
+    
+    if not os.path.exists(history_file):
+        print(f"Error: No history at {history_file}")
+        sys.exit(1)
+    
+    # Every query is a range scan over a start time index
+    query = ("SELECT {group} COUNT(DISTINCT run_id), COUNT(*), "
+             "TOTAL(outcome = 'finished'), TOTAL(outcome = 'skipped'), TOTAL(outcome = 'stopped'), "
+             "TOTAL(ended - started), AVG(drift_ms), MAX(ABS(drift_ms)) "
+             "FROM cycles WHERE started >= ? AND started < ? {grouping}")
+    try:
+        connection = sqlite3.connect(history_file)
+        try:
+            totals = connection.execute(query.format(group='', grouping=''), (since, until)).fetchone()
+            hooks = None
+            if connection.execute("SELECT 1 FROM sqlite_master WHERE name = 'hooks'").fetchone():
+                hooks = connection.execute(
+                    "SELECT COUNT(*), TOTAL(exit_code IS NOT 0), AVG(latency_ms), MAX(latency_ms) "
+                    "FROM hooks WHERE started >= ? AND started < ?", (since, until)).fetchone()
+            groups = []
+            if options.by:
+                period = f"strftime('{HISTORY_GROUPS[options.by]}', started, 'unixepoch', 'localtime')"
+                groups = connection.execute(query.format(group=f"{period},", grouping=f"GROUP BY {period}"),
+                                            (since, until)).fetchall()
+        finally:
+            connection.close()
+    except sqlite3.Error as e:
+        print(f"Error: Cannot read history ({e})")
+        sys.exit(1)
+    
+    since_str = datetime.fromtimestamp(since).strftime('%Y-%m-%d %H:%M') if since else "the beginning"
+    until_str = datetime.fromtimestamp(until).strftime('%Y-%m-%d %H:%M')
+    runs, cycles, finished, skipped, stopped, counted, avg_drift, max_drift = totals
+    print(f"  History from {since_str} to {until_str}")
+    print(f"    Runs                      {runs}")
+    print(f"    Cycles                    {cycles} ({int(finished)} finished, {int(skipped)} skipped, "
+          f"{int(stopped)} stopped)")
+    print(f"    Time counted              {format_hours(counted)}")
+    if avg_drift is not None:
+        print(f"    End drift                 avg {avg_drift:+.1f}ms, max {max_drift:.1f}ms")
+    if hooks is not None and hooks[0]:
+        hook_runs, hook_failures, avg_latency, max_latency = hooks
+        print(f"    Hooks                     {hook_runs} ({int(hook_failures)} failed), "
+              f"latency avg {avg_latency:.1f}ms, max {max_latency:.1f}ms")
+    
+    if groups:
+        print()
+        print(f"    {options.by.capitalize():<12}{'Runs':>6}{'Cycles':>8}{'Finished':>10}{'Time':>12}"
+              f"{'Avg drift':>12}{'Max drift':>12}")
+        for period, runs, cycles, finished, _, _, counted, avg_drift, max_drift in groups:
+            drift = (f"{avg_drift:>+10.1f}ms{max_drift:>10.1f}ms" if avg_drift is not None
+                     else f"{'-':>12}{'-':>12}")
+            print(f"    {period:<12}{runs:>6}{cycles:>8}{int(finished):>10}{format_hours(counted):>12}{drift}")
+
+# ============================================================================
+# FONT PACK CLASS
+# ============================================================================
+
+class FontPack:
+    """Reads named fonts from a memory-mapped pack, touching only the requested font"""
+    
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self.map = None
+        self.count = 0
+    
+    def open(self):
+        """Map the pack and check its header, False if missing or not a font pack"""
+        try:
+            with open(self.file_path, 'rb') as f:
+                self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return False
+        
+        if len(self.map) >= FONT_PACK_HEADER.size:
+            magic, version, count, _ = FONT_PACK_HEADER.unpack_from(self.map, 0)
+            index_end = FONT_PACK_HEADER.size + count * FONT_PACK_ENTRY.size
+            if magic == FONT_PACK_MAGIC and version == FONT_PACK_VERSION and len(self.map) >= index_end:
+                self.count = count
+                return True
+        
+        logger.log(f"Warning: {self.file_path} is not a font pack")
+        self.close()
+        return False
+    
+    def _entry(self, index):
+        """Name, offset and length of one index entry"""
+        name, offset, length = FONT_PACK_ENTRY.unpack_from(
+            self.map, FONT_PACK_HEADER.size + index * FONT_PACK_ENTRY.size)
+        return name.rstrip(b'\x00'), offset, length
+    
+    def names(self):
+        """Names of all fonts in the pack, in index order"""
+        return [self._entry(i)[0].decode('utf-8', 'replace') for i in range(self.count)]
+    
+    def load(self, name):
+        """Binary search the index and decode a single font, None if absent or damaged"""
+        key = name.encode('utf-8')
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            entry_name, offset, length = self._entry(middle)
+            if entry_name < key:
+                low = middle + 1
+            elif entry_name > key:
+                high = middle
+            else:
+                try:
+                    lines = self.map[offset:offset + length].decode('utf-8').split('\n')
+                except UnicodeDecodeError:
+                    logger.log(f"Warning: Font '{name}' in {self.file_path} is damaged")
+                    return None
+                chars = lines[0]
+                return {char: lines[1 + i * ASCII_HEIGHT:1 + (i + 1) * ASCII_HEIGHT]
+                        for i, char in enumerate(chars)}
+        return None
+    
+    def close(self):
+        """Unmap the pack so it can be rewritten"""
+        if self.map is not None:
+            self.map.close()
+            self.map = None
+        self.count = 0
+
+def font_errors(name, ascii_digits):
+    """Check a font before it is written to a pack"""
+    errors = []
+    
+    if not name or len(name.encode('utf-8')) > FONT_NAME_SIZE:
+        errors.append(f"Font name '{name}' must be 1 to {FONT_NAME_SIZE} bytes long")
+    
+    if not isinstance(ascii_digits, dict):
+        errors.append(f"Font '{name}' must be an object of glyphs")
+        return errors
+    
+    missing = [char for char in GLYPH_CHARS if char not in ascii_digits]
+    if missing:
+        errors.append(f"Font '{name}' is missing glyphs for {' '.join(missing)}")
+    
+    for char, rows in ascii_digits.items():
+        if len(char) != 1 or char == '\n':
+            errors.append(f"Font '{name}' has an invalid glyph key '{char}' (must be one character)")
+        elif (not isinstance(rows, list) or len(rows) != ASCII_HEIGHT
+                or not all(isinstance(row, str) and '\n' not in row for row in rows)):
+            errors.append(f"Font '{name}' glyph '{char}' must be {ASCII_HEIGHT} single-line strings")
+    
+    return errors
+
+def write_font_pack(file_path, fonts):
+    """Write fonts (name -> glyphs) as a pack, replacing the old file in one step"""
+    names = sorted(fonts, key=lambda name: name.encode('utf-8'))
+    records = []
+    for name in names:
+        chars = ''.join(fonts[name])
+        rows = [chars] + [row for char in chars for row in fonts[name][char]]
+        records.append('\n'.join(rows).encode('utf-8'))
+    
+    offset = FONT_PACK_HEADER.size + len(names) * FONT_PACK_ENTRY.size
+    parts = [FONT_PACK_HEADER.pack(FONT_PACK_MAGIC, FONT_PACK_VERSION, len(names), 0)]
+    for name, record in zip(names, records):
+        parts.append(FONT_PACK_ENTRY.pack(name.encode('utf-8'), offset, len(record)))
+        offset += len(record)
+    parts.extend(records)
+    
+    temp_path = file_path + '.tmp'
+    with open(temp_path, 'wb') as f:
+        f.write(b''.join(parts))
+    os.replace(temp_path, file_path)
+
+def fonts_command(args, pack_file):
+    """List the fonts in the pack, or merge fonts from JSON files into it"""
+    pack = FontPack(pack_file)
+    fonts = {}
+    if pack.open():
+        try:
+            if not args or args[0] != 'add':
+                for name in pack.names():
+                    print(name)
+                return
+            # Read every existing font before the pack is replaced, dropping damaged ones
+            for name in pack.names():
+                font = pack.load(name)
+                if font is None:
+                    print(f"Warning: Skipping damaged font '{name}' in {pack_file}, add it again to keep it")
+                    continue
+                fonts[name] = font
+        finally:
+            pack.close()
+    elif not args or args[0] != 'add':
+        print(f"Error: No font pack at {pack_file}")
+        print("Add fonts with: wincountdown fonts add FILE.json")
+        sys.exit(1)
+    
+    if len(args) < 2:
+        print("Error: Usage: wincountdown fonts add FILE.json [FILE.json ...]")
+        sys.exit(1)
+    
+    errors = []
+    added = []
+    for font_file in args[1:]:
+        try:
+            with open(font_file, 'r', encoding='utf-8') as f:
+                new_fonts = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            errors.append(f"Cannot read {font_file}: {e}")
+            continue
+        if not isinstance(new_fonts, dict):
+            errors.append(f"{font_file} must map font names to glyph objects")
+            continue
+        for name, ascii_digits in new_fonts.items():
+            problems = font_errors(name, ascii_digits)
+            errors.extend(problems)
+            if not problems:
+                fonts[name] = ascii_digits
+                added.append(name)
+    
+    if errors:
+        for error in errors:
+            print(f"Error: {error}")
+        sys.exit(1)
+    
+    write_font_pack(pack_file, fonts)
+    print(f"Added {', '.join(added)} to {pack_file} ({len(fonts)} fonts)")
+
+# ============================================================================
+# PROFILER CLASS
+# ============================================================================
+
+class Profiler:
+    """Profiles a countdown run with cProfile and tracemalloc snapshots"""
+    
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self.profile = cProfile.Profile()
+        self.snapshots = []
+    
+    def start(self):
+        """Start tracing allocations and profiling calls"""
+        tracemalloc.start()
+        self._take_snapshot("start")
+        self.profile.enable()
+    
+    def _take_snapshot(self, label):
+        """Record an allocation snapshot, excluding the profiler's own frames"""
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*>")
+        ))
+        self.snapshots.append((label, snapshot))
+    
+    def mid_run(self, remaining, total):
+        """Take the mid-run snapshot once the first cycle is half done"""
+        if len(self.snapshots) == 1 and remaining * 2 <= total:
+            self.profile.disable()
+            self._take_snapshot("mid-run")
+            self.profile.enable()
+    
+    def stop(self):
+        """Stop profiling and write the report file"""
+        self.profile.disable()
+        self._take_snapshot("end")
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        
+        with open(self.file_path, 'w', encoding='utf-8') as f:
+            f.write("WINCOUNTDOWN PROFILE REPORT\n")
+            f.write(f"Created: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+            f.write(f"Python: {sys.version}\n")
+            f.write(f"Traced memory: {current / 1024:.1f} KiB current, {peak / 1024:.1f} KiB peak\n\n")
+            
+            f.write(f"=== CALLS (top {PROFILE_TOP_FUNCTIONS} by cumulative time) ===\n")
+            stats_output = io.StringIO()
+            stats = pstats.Stats(self.profile, stream=stats_output)
+            stats.sort_stats('cumulative').print_stats(PROFILE_TOP_FUNCTIONS)
+            f.write(stats_output.getvalue())
+            
+            start_label, start_snapshot = self.snapshots[0]
+            for label, snapshot in self.snapshots[1:]:
+                f.write(f"\n=== ALLOCATIONS ({start_label} -> {label}, top {PROFILE_TOP_ALLOCATIONS}) ===\n")
+                for stat in snapshot.compare_to(start_snapshot, 'lineno')[:PROFILE_TOP_ALLOCATIONS]:
+                    f.write(f"{stat}\n")
+        
+        logger.log(f"Profile report written to: {self.file_path}")
+        print(f"Profile report written to: {self.file_path}", file=sys.stderr)
+
 # ============================================================================
 # TIMER CLASS
 # ============================================================================
@@ -580,11 +2036,42 @@ class DisplayManager:
 class CountdownTimer:
     """Main countdown timer logic"""
     
-    def __init__(self, config):
+    def __init__(self, config, output='console', config_manager=None):
         self.config = config
-        self.display = DisplayManager(config.get('ascii_digits', DEFAULT_ASCII_DIGITS))
+        self.config_manager = config_manager
+        self.console_output = output == 'console'
+        if self.console_output:
+            self.display = DisplayManager(config.get('ascii_digits', DEFAULT_ASCII_DIGITS),
+                                          ColorAttributes.from_config(config),
+                                          resolve_ambiguous_width(config.get('ambiguous_width', 'auto')))
+        else:
+            self.display = StreamDisplay(output)
+        self.time_bases = config.get('time_bases', DEFAULT_TIME_BASES)
+        self.formatters = {}
+        self.hooks = HookRunner(config)
+        self.alert = {}
+        self.profiler = None
+        self.console_factory = ConsoleManager
+        self.input_factory = ConsoleInput
+        self.beep = winsound.Beep
+        self.clock = time.time
+        self.status = None
+        if config_manager is not None and config.get('enable_status_export', True):
+            self.status = StatusExport(config_manager.status_file)
+        self.history = None
+        if config_manager is not None and config.get('enable_history', True):
+            self.history = HistoryStore(config_manager.history_file)
+            self.hooks.history = self.history
+    
+    def get_formatter(self, base='standard'):
+        """Return the formatter for a named time base, created on first use"""
+        formatter = self.formatters.get(base)
+        if formatter is None:
+            formatter = TimeFormatter.from_config(self.time_bases[base])
+            self.formatters[base] = formatter
+        return formatter
         
-    def parse_time(self, time_str, metric=False):
+    def parse_time(self, time_str, unit=1):
         """Parse time string in various formats"""
         hours = minutes = seconds = 0
         
@@ -619,8 +2106,8 @@ class CountdownTimer:
         # Calculate total seconds
         real_seconds = hours * 3600 + minutes * 60 + seconds
         
-        # Return milliseconds for metric, seconds for standard
-        return int(real_seconds * 1000) if metric else real_seconds
+        # Return counter ticks (milliseconds for metric, seconds for standard)
+        return real_seconds * unit
     
     def play_beeps(self, freq, count, duration, gap, silent, loop):
         """Play beep sounds when timer finishes"""
@@ -630,94 +2117,240 @@ class CountdownTimer:
         try:
             beeps_to_play = 1 if loop else count
             for i in range(beeps_to_play):
-                winsound.Beep(freq, duration)
+                self.beep(freq, duration)
                 if i < beeps_to_play - 1:
                     time.sleep(gap / 1000.0)
         except:
-            # Fallback to console beep
+            # Fallback to console beep; event streams already carry the alert event
+            if not self.console_output:
+                return
             beeps_to_play = 1 if loop else count
             for i in range(beeps_to_play):
                 print('\a', end='', flush=True)
                 if i < beeps_to_play - 1:
                     time.sleep(0.5)
     
+    def apply_config(self, changes):
+        """Apply reloaded config sections to the running timer"""
+        # A font from the pack takes the place of the config file's digits. set_font only
+        # replaces the digits once they are measured, so nothing changes if it raises
+        if 'ascii_digits' in changes and self.console_output and not self.config.get('font'):
+            self.display.set_font(changes['ascii_digits'])
+        
+        alert_keys = {'default_frequency': 'freq', 'default_beeps': 'count', 'default_duration': 'duration',
+                      'default_gap': 'gap', 'default_silent': 'silent'}
+        for key, name in alert_keys.items():
+            # Values given on the command line keep priority over the config file
+            if key in changes and self.alert.get(name) == self.config.get(key):
+                self.alert[name] = changes[key]
+        
+        self.config.update(changes)
+        if 'on_finish_hooks' in changes:
+            self.hooks.configure(self.config)
+    
+    def publish_status(self, state, start_time, cycle_total, remaining, unit, cycle, time_display):
+        """Write the current state to the status export, if enabled"""
+        if self.status is None:
+            return
+        if state == STATUS_PAUSED:
+            deadline = self.clock() + remaining / unit
+        else:
+            deadline = start_time + cycle_total / unit
+        self.status.update(deadline, remaining / unit, cycle_total / unit, cycle, state, time_display)
+    
+    def record_cycle(self, cycle, started, deadline, ended, outcome):
+        """Queue a cycle for the history store, if enabled"""
+        if self.history is None:
+            return
+        # Drift only means something for a cycle that ran to its deadline
+        drift_ms = (ended - deadline) * 1000 if outcome == 'finished' else None
+        self.history.record_cycle(cycle, started, deadline, ended, drift_ms, outcome)
+    
     def run(self, total_seconds, beep_freq=800, beep_count=3, beep_duration=1000, 
-            beep_gap=300, silent=False, loop=False, metric=False):
+            beep_gap=300, silent=False, loop=False, base='standard'):
         """Run the countdown timer"""
+        formatter = self.get_formatter(base)
+        
+        self.alert = {'freq': beep_freq, 'count': beep_count, 'duration': beep_duration,
+                      'gap': beep_gap, 'silent': silent}
         
         # Determine what units to show
-        if metric:
-            show_hours = total_seconds >= 10000000  # >= 1 metric hour
-            show_minutes = total_seconds >= 100000   # >= 1 metric minute
-        else:
-            show_hours = total_seconds >= 3600
-            show_minutes = total_seconds >= 60
+        fields = formatter.fields_for(total_seconds)
+        
+        keyboard = self.input_factory()
+        clock = self.clock
+        cycle = 0
+        
+        if self.status is not None:
+            try:
+                self.status.open(base)
+            except OSError as e:
+                logger.log(f"Could not open status file ({e}), status export disabled")
+                self.status = None
         
-        with ConsoleManager() as console:
+        if self.history is not None:
+            self.history.open()
+            self.history.record_run(clock(), total_seconds / formatter.unit, base, loop, silent,
+                                    beep_freq, beep_count, beep_duration, beep_gap)
+        cycle_started = None
+        completed = False
+        
+        with self.console_factory() if self.console_output else nullcontext() as console:
+            # Fall back to monochrome on consoles without ANSI escape support
+            if self.console_output and self.display.colors is not None:
+                if not console.enable_virtual_terminal():
+                    logger.log("Console does not support ANSI escapes, colors disabled")
+                    self.display.colors = None
+            
             try:
                 while True:  # Outer loop for restart functionality
-                    # Calculate start and end times
-                    import datetime
-                    start_datetime = datetime.datetime.now()
-                    start_time_str = start_datetime.strftime("%H:%M:%S")
+                    cycle += 1
                     
-                    # Calculate end time
-                    if metric:
-                        duration_seconds = total_seconds / 1000
-                    else:
-                        duration_seconds = total_seconds
+                    # The deadline is fixed before drawing so a slow console cannot shift it
+                    total_display = formatter.format(total_seconds, fields)
+                    start_time = clock()
+                    cycle_started = start_time
+                    outcome = 'finished'
                     
-                    end_datetime = start_datetime + datetime.timedelta(seconds=duration_seconds)
+                    # Calculate start and end times
+                    start_datetime = datetime.fromtimestamp(start_time)
+                    start_time_str = start_datetime.strftime("%H:%M:%S")
+                    end_datetime = start_datetime + timedelta(seconds=total_seconds / formatter.unit)
                     end_time_str = end_datetime.strftime("%H:%M:%S")
                     
-                    self.display.draw_static_ui(total_seconds, show_hours, show_minutes, 
-                                               metric, start_time_str, end_time_str, console)
+                    self.display.draw_static_ui(total_display, start_time_str, end_time_str, console)
                     
-                    start_time = time.time()
-                    last_remaining = -1
+                    cycle_total = total_seconds
+                    paused_at = None
+                    last_display = None
                     
                     while True:
-                        if metric:
-                            elapsed_ms = int((time.time() - start_time) * 1000)
-                            remaining = total_seconds - elapsed_ms
-                        else:
-                            elapsed = int(time.time() - start_time)
-                            remaining = total_seconds - elapsed
+                        now = clock() if paused_at is None else paused_at
+                        elapsed = int((now - start_time) * formatter.unit)
+                        remaining = max(cycle_total - elapsed, 0)
+                        
+                        # Round up so the display reaches zero exactly at the deadline
+                        shown = (remaining + formatter.unit - 1) // formatter.unit
+                        
+                        if self.profiler is not None:
+                            self.profiler.mid_run(remaining, total_seconds)
                         
-                        if remaining < 0:
+                        # Pick up config file edits, redrawing with any new digits
+                        if self.config_manager is not None:
+                            changes = self.config_manager.check_for_changes()
+                            if changes:
+                                # A bad edit must never end a running countdown
+                                try:
+                                    self.apply_config(changes)
+                                except Exception as e:
+                                    logger.log(f"Warning: Could not apply config changes ({type(e).__name__}: {e}), "
+                                               f"keeping current settings")
+                                else:
+                                    if 'ascii_digits' in changes:
+                                        last_display = None
+                        
+                        # Only update display when the shown time changes
+                        time_display = formatter.format(shown * formatter.unit, fields)
+                        if time_display != last_display:
+                            self.display.update_time_display(time_display, console, shown)
+                            self.publish_status(STATUS_RUNNING if paused_at is None else STATUS_PAUSED,
+                                                start_time, cycle_total, remaining, formatter.unit,
+                                                cycle, time_display)
+                            last_display = time_display
+                        
+                        if remaining == 0:
                             break
                         
-                        # Only update display when the second changes
-                        if remaining != last_remaining:
-                            if metric:
-                                total_metric_seconds = remaining // 1000
-                                hours = total_metric_seconds // 10000
-                                minutes = (total_metric_seconds % 10000) // 100
-                                seconds = total_metric_seconds % 100
+                        # Sleep until the shown time changes, waking early for a key press
+                        if paused_at is None:
+                            next_change = cycle_total - (shown - 1) * formatter.unit
+                            timeout = start_time + next_change / formatter.unit - clock() + WAKE_MARGIN
+                        else:
+                            timeout = PAUSED_WAKE_INTERVAL
+                        key = keyboard.wait(timeout)
+                        if key is None:
+                            continue
+                        
+                        key = key.lower()
+                        if key in (' ', 'p'):
+                            if paused_at is None:
+                                paused_at = clock()
                             else:
-                                hours = remaining // 3600
-                                minutes = (remaining % 3600) // 60
-                                seconds = remaining % 60
-                            
-                            self.display.update_time_display(hours, minutes, seconds, 
-                                                            show_hours, show_minutes, console)
-                            last_remaining = remaining
+                                start_time += clock() - paused_at
+                                paused_at = None
+                            self.display.show_paused(paused_at is not None, console)
+                        elif key in ('+', '='):
+                            cycle_total = min(cycle_total + formatter.minute, formatter.max_value + elapsed)
+                        elif key == '-':
+                            cycle_total = max(cycle_total - formatter.minute, elapsed)
+                        elif key == 'r':
+                            start_time = clock()
+                            cycle_total = total_seconds
+                            if paused_at is not None:
+                                paused_at = start_time
+                        elif key == 'n':
+                            logger.log(f"Skipping to the end of cycle {cycle}")
+                            outcome = 'skipped'
+                            break
                         
-                        time.sleep(UPDATE_INTERVAL_METRIC if metric else UPDATE_INTERVAL_STANDARD)
+                        # Added time may need more fields than the original duration
+                        fields = max(fields, formatter.fields_for(cycle_total - elapsed))
+                        self.publish_status(STATUS_RUNNING if paused_at is None else STATUS_PAUSED,
+                                            start_time, cycle_total, cycle_total - elapsed, formatter.unit,
+                                            cycle, last_display)
+                    
+                    # Time's up! Start the beeps first so drawing never delays them
+                    ended = clock()
+                    alert = self.alert
+                    beeps = threading.Thread(target=self.play_beeps, daemon=True,
+                                             args=(alert['freq'], alert['count'], alert['duration'],
+                                                   alert['gap'], alert['silent'], loop))
+                    beeps.start()
                     
-                    # Time's up!
-                    self.display.draw_finished_screen(show_hours, show_minutes, loop)
+                    zero_display = formatter.format(0, fields)
+                    self.display.draw_finished_screen(zero_display, loop, console)
+                    if not alert['silent']:
+                        self.display.notify_alert(1 if loop else alert['count'])
+                    self.publish_status(STATUS_FINISHED, start_time, cycle_total, 0, formatter.unit,
+                                        cycle, zero_display)
                     
-                    # Play beeps
-                    self.play_beeps(beep_freq, beep_count, beep_duration, beep_gap, silent, loop)
+                    # Hooks run in the background so they never delay the alert
+                    self.hooks.submit('cycle' if loop else 'finish', cycle)
+                    self.record_cycle(cycle, cycle_started, start_time + cycle_total / formatter.unit,
+                                      ended, outcome)
+                    cycle_started = None
                     
+                    beeps.join()
                     if not loop:
                         break
                     
                     time.sleep(1)  # Wait before restarting
                     
+                completed = True
+                    
             except KeyboardInterrupt:
+                self.hooks.shutdown(wait=False)
                 raise  # Re-raise to be handled by main
+            finally:
+                if self.console_output and self.display.writer is not None:
+                    self.display.writer.close()
+                
+                # However the run ended, status readers must not see it as still running
+                if self.status is not None:
+                    if not completed:
+                        self.status.update(clock(), 0, 0, cycle, STATUS_STOPPED, "")
+                    self.status.close()
+                
+                # Let finish hooks complete so their results are recorded, after Ctrl+C
+                # the pool is already stopped
+                self.hooks.shutdown()
+                
+                # Record an interrupted cycle and flush queued rows on every exit path
+                if cycle_started is not None:
+                    self.record_cycle(cycle, cycle_started, start_time + cycle_total / formatter.unit,
+                                      clock(), 'stopped')
+                if self.history is not None:
+                    self.history.close()
 
 # ============================================================================
 # ARGUMENT PROCESSING
@@ -780,13 +2413,22 @@ def parse_arguments(args, config):
                         default=config.get('default_loop', False))
     parser.add_argument('-m', '--metric', action='store_true',
                         default=config.get('default_metric', False))
+    parser.add_argument('--base', default=config.get('default_base', 'standard'), metavar='NAME')
+    parser.add_argument('--profile', action='store_true')
+    parser.add_argument('--no-color', action='store_true')
+    parser.add_argument('--font', default=config.get('font', ''), metavar='NAME')
+    parser.add_argument('-o', '--output', choices=OUTPUT_MODES,
+                        default=config.get('default_output', 'auto'), metavar='MODE')
     
     return parser.parse_args(args)
 
-def validate_arguments(args, metric=False):
+def validate_arguments(args, time_bases=DEFAULT_TIME_BASES):
     """Validate argument constraints"""
     errors = []
     
+    if args.base not in time_bases:
+        errors.append(f"Unknown time base '{args.base}' (available: {', '.join(time_bases)})")
+    
     if not 37 <= args.freq <= 32767:
         errors.append("Frequency must be between 37 and 32767 Hz")
     
@@ -827,6 +2469,11 @@ def print_help():
   +===================================================================================================================+
 
     wincountdown <time> [options]
+    wincountdown status                Print the remaining time of the running timer
+    wincountdown stats [--since WHEN] [--until WHEN] [--by day|week|month]
+                                       Summarize finished cycles, time counted and end drift
+    wincountdown fonts                 List the fonts in the font pack
+    wincountdown fonts add FILE.json   Add the fonts in FILE.json to the font pack
 
   +===================================================================================================================+
   | TIME FORMATS                                                                                                      |
@@ -849,6 +2496,11 @@ def print_help():
     -g MS, --gap MS           Gap between beeps in milliseconds (default: from config, or 300)
     -l, --loop                Automatically restart countdown when it reaches 0
     -m, --metric              JOKE: Display in metric time (1h=100m, 1m=100s)
+    --base NAME               Display time base from the config file (default: standard)
+    -o MODE, --output MODE    auto, console, json or plain (default: auto, json when piped)
+    --profile                 Write a CPU and memory profile to wincountdown-profile.txt
+    --no-color                Monochrome display (ignore color settings in config)
+    --font NAME               Use a font from the font pack (default: from config)
     -h, --help                Show this help message
 
   +===================================================================================================================+
@@ -861,6 +2513,7 @@ def print_help():
       - Default silent, loop, and metric mode settings
       - Behavior when running 'wincountdown' with no arguments
       - Auto-apply flags when only providing a time argument
+      - Time bases used to split the display into fields
       - ASCII art for digits 0-9 and colon (:)
 
     See the config file for detailed comments on each option.
@@ -900,10 +2553,15 @@ def print_help():
     Default beep              From config file (or 800Hz, 1000ms, 3 times if config missing)
     Loop mode beep            Only one beep before restarting
     Stop timer                Press Ctrl+C at any time
+    Keys while running        Space pause/resume, + / - add or remove 1 minute,
+                              R reset, N skip to the end of the countdown
     Metric mode               Input real time, display as metric (1h=100m, 1m=100s)
                               Each metric second lasts 1 real second
     Config file               Edit wincountdown-config.json to customize defaults
     ASCII art                 Customize digit appearance in config file
+    Font packs                Switch digit styles with --font NAME (see 'wincountdown fonts')
+    History                   Runs and cycles are kept in wincountdown-history.db
+                              WHEN is YYYY-MM-DD[THH:MM], today, or a span back like 12h, 7d, 4w
 
   +===================================================================================================================+
 
@@ -942,6 +2600,40 @@ def main():
         print_help()
         sys.exit(0)
     
+    # Status subcommand reads the state published by a running timer
+    if effective_args and effective_args[0] == 'status':
+        status = read_status(config_manager.status_file)
+        if status is None or status['state'] in ('finished', 'stopped'):
+            sys.exit(1)
+        
+        # A killed or closed timer never marks itself stopped, but its deadline passes
+        remaining = status['remaining'] if status['paused'] else status['deadline'] - time.time()
+        if remaining <= 0:
+            sys.exit(1)
+        
+        # Count down from the deadline in the timer's own base and field count. A base
+        # since removed from the config can only be shown as last published
+        time_bases = config.get('time_bases', DEFAULT_TIME_BASES)
+        if status['base'] in time_bases:
+            formatter = TimeFormatter.from_config(time_bases[status['base']])
+            shown = int(-(-remaining // 1))
+            display = formatter.format(shown * formatter.unit, min(status['fields'], formatter.max_fields))
+        else:
+            display = status['display']
+        print(display + " (paused)" if status['paused'] else display)
+        sys.exit(0)
+    
+    # Stats subcommand answers range and aggregate queries over the history
+    if effective_args and effective_args[0] == 'stats':
+        stats_command(effective_args[1:], config_manager.history_file)
+        sys.exit(0)
+    
+    # Fonts subcommand lists or extends the font pack
+    font_pack_file = os.path.join(script_dir, config.get('font_pack', DEFAULT_CONFIG['font_pack']))
+    if effective_args and effective_args[0] == 'fonts':
+        fonts_command(effective_args[1:], font_pack_file)
+        sys.exit(0)
+    
     # Parse arguments
     args = parse_arguments(effective_args, config)
     
@@ -950,50 +2642,87 @@ def main():
         print_help()
         sys.exit(1)
     
+    # Metric flag is shorthand for the metric time base
+    if args.metric:
+        args.base = 'metric'
+    
     # Validate arguments
-    errors = validate_arguments(args, args.metric)
+    errors = validate_arguments(args, config.get('time_bases', DEFAULT_TIME_BASES))
     if errors:
         for error in errors:
             print(f"Error: {error}")
         sys.exit(1)
     
+    if args.no_color:
+        config['enable_colors'] = False
+    
+    # Load only the selected font from the pack
+    if args.font:
+        pack = FontPack(font_pack_file)
+        if not pack.open():
+            print(f"Error: Font '{args.font}' requested but no font pack found at {font_pack_file}")
+            sys.exit(1)
+        try:
+            font = pack.load(args.font)
+            if font is None:
+                print(f"Error: Unknown font '{args.font}' (available: {', '.join(pack.names())})")
+                sys.exit(1)
+        finally:
+            pack.close()
+        config_manager.validate_ascii_digits(font, config)
+        config['font'] = args.font
+        config['ascii_digits'] = font
+        logger.log(f"Loaded font '{args.font}' from {font_pack_file}")
+    
+    # Stream events instead of drawing when output is not a terminal
+    output = args.output
+    if output == 'auto':
+        output = 'console' if sys.stdout.isatty() else 'json'
+    logger.log(f"Output mode: {output}")
+    
     # Initialize timer
-    timer = CountdownTimer(config)
+    timer = CountdownTimer(config, output, config_manager)
     
     try:
         # Parse time
-        total_seconds = timer.parse_time(args.time, args.metric)
+        formatter = timer.get_formatter(args.base)
+        total_seconds = timer.parse_time(args.time, formatter.unit)
         if total_seconds <= 0:
             print("Error: Time must be greater than 0")
             sys.exit(1)
         
         # Check maximum time
-        max_seconds = MAX_METRIC_MILLISECONDS if args.metric else MAX_STANDARD_SECONDS
-        
-        if total_seconds > max_seconds:
-            print(f"Error: Time exceeds maximum of 99:99:99")
-            if args.metric:
-                total_metric_seconds = total_seconds // 1000
-                hours = total_metric_seconds // 10000
-                minutes = (total_metric_seconds % 10000) // 100
-                seconds = total_metric_seconds % 100
-                print(f"You requested: {hours:02d}:{minutes:02d}:{seconds:02d} (metric)")
-            else:
-                hours = total_seconds // 3600
-                minutes = (total_seconds % 3600) // 60
-                seconds = total_seconds % 60
-                print(f"You requested: {hours:02d}:{minutes:02d}:{seconds:02d}")
+        if total_seconds > formatter.max_value:
+            label = f" ({formatter.label})" if formatter.label else ""
+            print(f"Error: Time exceeds maximum of {formatter.format(formatter.max_value, formatter.max_fields)}")
+            print(f"You requested: {formatter.format(total_seconds, formatter.max_fields)}{label}")
             sys.exit(1)
         
+        # Profile the run when requested, writing the report even on Ctrl+C
+        if args.profile:
+            timer.profiler = Profiler(config_manager.profile_file)
+            timer.profiler.start()
+        
         # Run countdown
-        timer.run(total_seconds, args.freq, args.beeps, args.duration, 
-                 args.gap, args.silent, args.loop, args.metric)
+        try:
+            timer.run(total_seconds, args.freq, args.beeps, args.duration, 
+                     args.gap, args.silent, args.loop, args.base)
+        finally:
+            if timer.profiler is not None:
+                timer.profiler.stop()
         
     except ValueError:
         print("Error: Invalid time format")
         sys.exit(1)
     except KeyboardInterrupt:
-        print("\n\nTimer stopped!")
+        if timer.console_output:
+            print("\n\nTimer stopped!")
+        else:
+            timer.display.emit("stop")
+        sys.exit(0)
+    except BrokenPipeError:
+        # Event consumer went away, stop quietly
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
         sys.exit(0)
 
 if __name__ == "__main__":
@@ -0,0 +1,254 @@
+import sys
+import time
+import math
+import argparse
+import tracemalloc
+from contextlib import redirect_stdout
+
+import wincountdown
+from wincountdown import CountdownTimer, FrameWriter, DEFAULT_CONFIG, TIME_ROW
+
+# Loop counters such as elapsed ticks are plain ints; keeping them above the
+# interpreter's small-int cache (up to 256) makes them heap objects at both
+# snapshots, so only real growth shows up as a difference
+ALLOC_WARMUP_TICKS = 300
+
+# A value replaced during the window (a new slowest write time, a float reused
+# from the interpreter's free list) can shift a block or two; a real leak grows
+# with every tick and shows up as thousands
+ALLOC_TOLERANCE_BLOCKS = 8
+
+# ============================================================================
+# STAND-IN CONSOLE AND AUDIO
+# ============================================================================
+
+class BenchConsole:
+    """Console stand-in that accepts cursor and screen calls without a real console"""
+    
+    def set_position(self, x, y):
+        pass
+    
+    def clear_screen(self):
+        pass
+    
+    def enable_virtual_terminal(self):
+        return True
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *args):
+        pass
+
+class BenchInput:
+    """Keyboard stand-in that never reports a key press"""
+    
+    def wait(self, timeout):
+        time.sleep(max(0.0, timeout))
+        return None
+
+class FastClock:
+    """Clock and keyboard stand-in that jumps ahead instead of sleeping"""
+    
+    def __init__(self):
+        self.now = time.time()
+    
+    def time(self):
+        return self.now
+    
+    def wait(self, timeout):
+        self.now += max(0.0, timeout)
+        return None
+
+class NullOutput:
+    """Discards everything the display prints, optionally stalling like a slow console"""
+    
+    def __init__(self, flush_delay=0.0):
+        self.flush_delay = flush_delay
+    
+    def write(self, text):
+        return len(text)
+    
+    def flush(self):
+        if self.flush_delay:
+            time.sleep(self.flush_delay)
+
+class Recorder:
+    """Records when each stage of one countdown happened"""
+    
+    def __init__(self, timer):
+        self.start = None
+        self.last_update = None
+        self.finished = None
+        self.alert = None
+        
+        display = timer.display
+        draw_static_ui = display.draw_static_ui
+        write_frame = display.write_frame
+        draw_finished_screen = display.draw_finished_screen
+        
+        def record_start(*args, **kwargs):
+            # The timer takes its start time right before the static UI is drawn
+            self.start = time.time()
+            draw_static_ui(*args, **kwargs)
+        
+        def record_write_frame(region, first_row, lines, console):
+            # Time the write itself: once the console falls behind, frames are only
+            # queued here and written later from the frame writer's thread
+            if display.writer is None:
+                display.writer = FrameWriter(console)
+                write = display.writer._write
+                
+                def record_write(first_row, lines):
+                    write(first_row, lines)
+                    if first_row == TIME_ROW:
+                        self.last_update = time.time()
+                
+                display.writer._write = record_write
+            write_frame(region, first_row, lines, console)
+        
+        def record_finished(*args, **kwargs):
+            draw_finished_screen(*args, **kwargs)
+            self.finished = time.time()
+        
+        def record_beep(freq, duration):
+            # The first sample reaches the sound device as soon as Beep is entered
+            if self.alert is None:
+                self.alert = time.time()
+        
+        display.draw_static_ui = record_start
+        display.write_frame = record_write_frame
+        display.draw_finished_screen = record_finished
+        timer.beep = record_beep
+
+# ============================================================================
+# BENCHMARK
+# ============================================================================
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers"""
+    ordered = sorted(values)
+    index = max(0, math.ceil(pct / 100 * len(ordered)) - 1)
+    return ordered[index]
+
+def run_once(config, seconds, base, write_delay=0.0):
+    """Run a single countdown, returning deadline offsets in ms and the frame counters"""
+    timer = CountdownTimer(config, 'console')
+    timer.console_factory = BenchConsole
+    timer.input_factory = BenchInput
+    recorder = Recorder(timer)
+    
+    formatter = timer.get_formatter(base)
+    with redirect_stdout(NullOutput(write_delay)):
+        timer.run(seconds * formatter.unit, beep_count=1, beep_duration=1, silent=False, base=base)
+    
+    deadline = recorder.start + seconds
+    writer = timer.display.writer
+    offsets = {
+        "last update": (recorder.last_update - deadline) * 1000,
+        "finished screen": (recorder.finished - deadline) * 1000,
+        "first alert": (recorder.alert - deadline) * 1000
+    }
+    return offsets, writer.frames_written, writer.frames_dropped
+
+def check_allocations(config, warmup, ticks):
+    """Run ticks on a fast clock and return wincountdown allocations still alive after them"""
+    timer = CountdownTimer(config, 'console')
+    clock = FastClock()
+    timer.clock = clock.time
+    timer.console_factory = BenchConsole
+    timer.input_factory = lambda: clock
+    
+    # Snapshot once the caches are warm and again after the measured ticks
+    snapshots = []
+    update_time_display = timer.display.update_time_display
+    
+    def measured_update(*args, **kwargs):
+        update_time_display(*args, **kwargs)
+        if timer.display.ticks in (warmup, warmup + ticks):
+            snapshots.append(tracemalloc.take_snapshot())
+        timer.display.ticks += 1
+    
+    timer.display.ticks = 0
+    timer.display.update_time_display = measured_update
+    
+    # Leave a margin so the measured ticks stay clear of the color thresholds
+    margin = max([0] + [t.get('below', 0) for t in config.get('color_thresholds', [])]) + ALLOC_WARMUP_TICKS
+    tracemalloc.start()
+    try:
+        with redirect_stdout(NullOutput()):
+            timer.run(warmup + ticks + margin, silent=True)
+    finally:
+        tracemalloc.stop()
+    
+    filters = [tracemalloc.Filter(True, wincountdown.__file__)]
+    before, after = (snapshot.filter_traces(filters) for snapshot in snapshots)
+    return [stat for stat in after.compare_to(before, 'lineno') if stat.size_diff or stat.count_diff]
+
+def main():
+    """Run the benchmark and report latency percentiles"""
+    parser = argparse.ArgumentParser(
+        prog='wincountdown_bench',
+        description='Measure how far display and alert land from the ideal countdown deadline'
+    )
+    parser.add_argument('-r', '--runs', type=int, default=20, help='Number of countdowns (default: 20)')
+    parser.add_argument('-s', '--seconds', type=int, default=1, help='Length of each countdown (default: 1)')
+    parser.add_argument('--base', default='standard', help='Time base to run in (default: standard)')
+    parser.add_argument('--write-delay-ms', type=float, default=0.0,
+                        help='Stall every console flush this long to simulate a slow terminal (default: 0)')
+    parser.add_argument('--budget-ms', type=float, default=None,
+                        help='Fail when any p99 offset exceeds this many milliseconds')
+    parser.add_argument('--alloc-check', type=int, default=None, metavar='TICKS',
+                        help='Instead of timing, check that TICKS steady-state ticks leave no allocations behind')
+    args = parser.parse_args()
+    
+    config = dict(DEFAULT_CONFIG)
+    if args.alloc_check is not None:
+        leaking = []
+        for colors in (True, False):
+            config['enable_colors'] = colors
+            stats = check_allocations(config, ALLOC_WARMUP_TICKS, args.alloc_check)
+            mode = 'color' if colors else 'monochrome'
+            blocks = sum(stat.count_diff for stat in stats)
+            print(f"{mode}: {blocks:+d} blocks, {sum(stat.size_diff for stat in stats):+d} bytes "
+                  f"after {args.alloc_check} ticks")
+            for stat in stats[:10]:
+                print(f"  {stat}")
+            if abs(blocks) > ALLOC_TOLERANCE_BLOCKS:
+                leaking.append(mode)
+        if leaking:
+            print(f"\nFAIL: the tick loop keeps allocating in {', '.join(leaking)} mode")
+            sys.exit(1)
+        print("\nOK: no net allocations in the steady-state tick loop")
+        return
+    
+    results = {}
+    frames_written = frames_dropped = 0
+    for i in range(args.runs):
+        offsets, written, dropped = run_once(config, args.seconds, args.base, args.write_delay_ms / 1000)
+        for stage, offset in offsets.items():
+            results.setdefault(stage, []).append(offset)
+        frames_written += written
+        frames_dropped += dropped
+        print(f"\rRun {i + 1}/{args.runs}", end='', flush=True)
+    print()
+    
+    print(f"\nOffset from ideal deadline over {args.runs} x {args.seconds}s countdowns (ms)")
+    print(f"  {'stage':<18}{'p50':>10}{'p95':>10}{'p99':>10}{'max':>10}")
+    over_budget = []
+    for stage, offsets in results.items():
+        p99 = percentile(offsets, 99)
+        print(f"  {stage:<18}{percentile(offsets, 50):>10.2f}{percentile(offsets, 95):>10.2f}"
+              f"{p99:>10.2f}{max(offsets):>10.2f}")
+        if args.budget_ms is not None and p99 > args.budget_ms:
+            over_budget.append(stage)
+    print(f"\nFrames written: {frames_written}, dropped: {frames_dropped}")
+    
+    if over_budget:
+        print(f"\nFAIL: p99 over {args.budget_ms}ms budget for: {', '.join(over_budget)}")
+        sys.exit(1)
+    if args.budget_ms is not None:
+        print(f"\nOK: all p99 offsets within {args.budget_ms}ms budget")
+
+if __name__ == "__main__":
+    main()